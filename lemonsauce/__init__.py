@@ -1,10 +1,10 @@
-from .spectrumtools import template_pigment, d65, extreme_spectrum, normalise_spectral_density, \
+from .spectrumtools import template_pigment, d65, extreme_spectrum, extreme_spectra, normalise_spectral_density, \
     total_absorption, total_transmission, reflectance_to_rgb, spectrum_to_rgb
 
 from .solidtools import ColourSolid as ColourSolid
 
 __all__ = ["ColourSolid",
-           "template_pigment", "d65", "extreme_spectrum",
+           "template_pigment", "d65", "extreme_spectrum", "extreme_spectra",
            "total_absorption", "total_transmission", "normalise_spectral_density",
            "reflectance_to_rgb", "spectrum_to_rgb"]
 
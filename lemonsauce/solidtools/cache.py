@@ -0,0 +1,108 @@
+""" On-disk cache for colour solid geometry
+
+Solids are stored in a directory, one file per solid (see `storage`), named by a hash of everything that determines
+the geometry. This includes the calculation method, as the methods give different triangulations (and the
+iterative and incremental methods are less exact for nearly degenerate curves), so each is cached separately.
+The cache is only used if a directory is given when the solid is created, or if the environment variable
+LEMONSAUCE_CACHE is set.
+
+"""
+
+import hashlib
+import os
+
+from numpy import array, ascontiguousarray
+
+from .hull import HullData
+from .storage import write_container, read_container
+
+# Change this whenever the way the geometry is calculated or stored changes, so old entries are not used
+CACHE_VERSION = 3
+
+# Environment variable specifying a default cache directory
+CACHE_ENVIRONMENT_VARIABLE = "LEMONSAUCE_CACHE"
+
+
+def cache_directory(directory: str = None):
+    """ Directory to use for caching, or None if caching is disabled
+
+    Args:
+        directory (str or None): Directory to use, if None, the LEMONSAUCE_CACHE environment variable is checked
+    """
+
+    if directory is None:
+        directory = os.environ.get(CACHE_ENVIRONMENT_VARIABLE)
+
+    if not directory:
+        return None
+
+    return directory
+
+
+def cache_key(base_curves: array, wavelengths: array, simplify_tolerance: float, max_error: float, method: str):
+    """ Hash identifying a colour solid's geometry
+
+    Args:
+        base_curves (array): The normalised fractional yield curves
+        wavelengths (array or None): Wavelengths for the curves
+        simplify_tolerance (float): Tolerance used for simplifying the curves
+        max_error (float or None): Error bound used for simplifying the curves
+        method (str): Method the geometry is calculated with, see `ColourSolid.calculate`
+
+    Returns:
+        hexadecimal string
+    """
+
+    digest = hashlib.sha256()
+    digest.update(("lemonsauce solid v%i;" % CACHE_VERSION).encode())
+
+    for data in (base_curves, wavelengths):
+        if data is None:
+            digest.update(b"none;")
+        else:
+            data = ascontiguousarray(data, dtype=float)
+            digest.update(("%s;" % str(data.shape)).encode())
+            digest.update(data.tobytes())
+
+    digest.update(("%r;%r;%s" % (simplify_tolerance, max_error, method)).encode())
+
+    return digest.hexdigest()
+
+
+def _filename(directory: str, key: str):
+    return os.path.join(directory, key + ".solid")
+
+
+def load_hull(directory: str, key: str):
+    """ Load geometry from the cache
+
+    Returns:
+        HullData object, or None if it is not in the cache
+    """
+
+    filename = _filename(directory, key)
+
+    if not os.path.exists(filename):
+        return None
+
+    data, _ = read_container(filename, mmap=True)
+
+    return HullData(data["points"], data["simplices"], data["equations"], data["vertices"])
+
+
+def save_hull(directory: str, key: str, hull):
+    """ Store geometry in the cache
+
+    Args:
+        directory (str): Cache directory, it is created if it doesn't exist
+        key (str): Output of `cache_key`
+        hull: HullData or scipy.spatial.ConvexHull object
+    """
+
+    os.makedirs(directory, exist_ok=True)
+
+    write_container(_filename(directory, key),
+                    {"points": hull.points,
+                     "simplices": hull.simplices,
+                     "equations": hull.equations,
+                     "vertices": hull.vertices})
@@ -1,37 +1,30 @@
 """ Geometry helper functions """
 
-from numpy import array, eye, argmax, concatenate
-
-
-def sort_pair(a, b):
-    if a > b:
-        return [b, a]
-    else:
-        return [a, b]
+from numpy import array, eye, argmax, concatenate, asarray, triu_indices, stack, sort, any
+from numpy.linalg import svd
 
 
 def expand_simplex(simplex: array):
-    """Takes a list of indices representing a simplex and returns all the edges
+    """Takes indices representing a simplex (or many of them) and returns all the edges
 
     Args:
-        simplex: Array (or list) of indices describing a simplex e.g. array([1,2,6]) for a triangle
+        simplex: Array (or list) of indices describing a simplex e.g. array([1,2,6]) for a triangle,
+                 or a two dimensional array with one simplex in each row
 
     Returns:
-        Ordered edges ([smallest, biggest]) in the simplex as a list e.g. [[1,2],[1,6],[2,6]]
+        Array of ordered edges ([smallest, biggest]) in the simplex e.g. array([[1,2],[1,6],[2,6]]),
+        for many simplices, the edges of each are given in turn
 
     """
 
-    n = len(simplex)
+    simplex = asarray(simplex)
+    simplices = simplex.reshape(-1, simplex.shape[-1]) if simplex.ndim > 0 else simplex.reshape(1, 1)
 
-    if n > 1:
-        start = simplex[0]
-        out = []
-        for i in range(1, n):
-            out.append(sort_pair(start, simplex[i]))
+    first, second = triu_indices(simplices.shape[1], k=1)
 
-        return out + expand_simplex(simplex[1:])
-    else:
-        return []
+    edges = stack((simplices[:, first], simplices[:, second]), axis=2).reshape(-1, 2)
+
+    return sort(edges, axis=1)
 
 
 # Key mapping used for removing duplicates
@@ -166,6 +159,30 @@ def implicit_line(p: array, q: array):
     return A, b
 
 
+def hyperplane_basis(normal: array):
+    """ Orthonormal basis for the directions perpendicular to a given normal
+
+    Args:
+        normal (array_like): normal to the hyperplane, of length d
+
+    Returns:
+        d-by-(d-1) matrix, the columns of which are orthonormal and perpendicular to the normal
+    """
+
+    normal = asarray(normal, dtype=float)
+
+    if len(normal.shape) != 1:
+        raise ValueError("normal should be a vector")
+
+    if not any(normal != 0):
+        raise ValueError("normal should be non-zero")
+
+    # The right singular vectors other than the first span the space perpendicular to the normal
+    _, _, vt = svd(normal.reshape(1, -1))
+
+    return vt[1:, :].T
+
+
 if __name__ == "__main__":
     # Test the implicit_line function
 
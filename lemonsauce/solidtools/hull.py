@@ -0,0 +1,175 @@
+""" Storage for the boundary of a convex solid """
+
+from math import factorial
+
+from numpy import array, arange, argsort, arctan2, mean, dot, zeros, argmin, where, inf, errstate, concatenate, \
+    matmul, sum, abs, sqrt, sort, lexsort, tile, delete, all
+from numpy.linalg import pinv, det
+
+
+class HullData:
+    def __init__(self, points: array, simplices: array, equations: array, vertices: array = None):
+        """ Boundary data for a convex solid
+
+        This has the same fields as scipy.spatial.ConvexHull, with the same meanings, so that it can be used in
+        its place: `points`, `simplices`, `equations`, `vertices`, `neighbors`, `coplanar`, `volume`, `area`,
+        `ndim`, `npoints`, `nsimplex`, `min_bound` and `max_bound`. Those not given here are worked out from
+        these when they are first used. `coplanar` is always empty, as all the points are used by the simplices.
+
+        Args:
+            points (array): n-by-d array of points
+            simplices (array): indices of points making up the (d-1)-simplices of the boundary
+            equations (array): [normal, offset] for the hyperplane of each simplex, normal.x + offset <= 0 inside
+            vertices (array or None): indices of the points that are vertices of the solid, defaults to all
+                (in 2D, they are put in order around the solid, as they are for ConvexHull)
+        """
+
+        self.points = points
+        self.simplices = simplices
+        self.equations = equations
+
+        if vertices is None:
+            if points.shape[1] == 2:
+                centre = mean(points, axis=0)
+                vertices = argsort(arctan2(points[:, 1] - centre[1], points[:, 0] - centre[0]))
+            else:
+                vertices = arange(len(points))
+
+        self.vertices = vertices
+
+        self._neighbors = None
+
+    @property
+    def ndim(self):
+        """ Dimension of the space containing the solid """
+        return self.points.shape[1]
+
+    @property
+    def npoints(self):
+        """ Number of points """
+        return self.points.shape[0]
+
+    @property
+    def nsimplex(self):
+        """ Number of simplices """
+        return self.simplices.shape[0]
+
+    @property
+    def min_bound(self):
+        """ Smallest value of each coordinate """
+        return self.points.min(axis=0)
+
+    @property
+    def max_bound(self):
+        """ Largest value of each coordinate """
+        return self.points.max(axis=0)
+
+    @property
+    def coplanar(self):
+        """ Points that are not used by any simplex (with the nearest simplex and vertex), there are none """
+        return zeros((0, 3), dtype=int)
+
+    @property
+    def volume(self):
+        """ Volume of the solid, as the sum of the volumes of the cones from its centre to each simplex """
+
+        centre = mean(self.points[self.vertices, :], axis=0)
+        corners = self.points[self.simplices, :] - centre
+
+        return float(sum(abs(det(corners)))) / factorial(self.ndim)
+
+    @property
+    def area(self):
+        """ Area (or the (d-1) dimensional equivalent) of the boundary of the solid """
+
+        corners = self.points[self.simplices, :]
+        edges = corners[:, 1:, :] - corners[:, :1, :]
+
+        return float(sum(sqrt(abs(det(matmul(edges, edges.transpose(0, 2, 1))))))) / factorial(self.ndim - 1)
+
+    @property
+    def neighbors(self):
+        """ Indices of the neighbouring simplices, the j-th being opposite the j-th vertex (-1 if there is none) """
+
+        if self._neighbors is None:
+            n_simplices, n_vertices = self.simplices.shape
+
+            # Each ridge appears in two simplices, once opposite each of their vertices
+            ridges = sort(concatenate([delete(self.simplices, j, axis=1) for j in range(n_vertices)]), axis=1)
+            owners = tile(arange(n_simplices), n_vertices)
+
+            order = lexsort(ridges.T[::-1])
+            ridges = ridges[order, :]
+            owners = owners[order]
+
+            paired = concatenate((all(ridges[1:, :] == ridges[:-1, :], axis=1), [False]))
+
+            neighbors = zeros(n_simplices * n_vertices, dtype=int) - 1
+            neighbors[order[:-1][paired[:-1]]] = owners[1:][paired[:-1]]
+            neighbors[order[1:][paired[:-1]]] = owners[:-1][paired[:-1]]
+
+            self._neighbors = neighbors.reshape(n_vertices, n_simplices).T
+
+        return self._neighbors
+
+
+def ray_facet_intersections(equations: array, origin: array, directions: array, chunk_size: int = None):
+    """ Find where rays from a point inside a convex solid leave it
+
+    Args:
+        equations (array): [normal, offset] for each facet, normal.x + offset <= 0 inside (as in HullData)
+        origin (array): A point inside the solid
+        directions (array): M-by-d array of non-zero directions
+        chunk_size (int or None): Number of rays to work on at once, memory use is proportional to this times the
+            number of facets, by default, it is chosen to keep this to a few million
+
+    Returns:
+        tuple of (t, facets), where origin + t * direction is on the boundary, and facets is the index
+        of the facet it is on
+    """
+
+    if chunk_size is None:
+        chunk_size = max(1, 2**22 // len(equations))
+
+    normals = equations[:, :-1]
+    clearances = -(dot(normals, origin) + equations[:, -1])
+
+    t = zeros(len(directions))
+    facets = zeros(len(directions), dtype=int)
+
+    for start in range(0, len(directions), chunk_size):
+        speeds = dot(directions[start:start+chunk_size, :], normals.T)
+
+        # Only facets the ray is moving towards can be hit
+        with errstate(divide="ignore"):
+            times = where(speeds > 0, clearances / speeds, inf)
+
+        facets[start:start+chunk_size] = argmin(times, axis=1)
+        t[start:start+chunk_size] = times[arange(len(times)), facets[start:start+chunk_size]]
+
+    return t, facets
+
+
+def simplex_coordinates(corners: array, normals: array, points: array):
+    """ Barycentric coordinates of points lying in the hyperplanes of (d-1)-simplices
+
+    Args:
+        corners (array): M-by-d-by-d array, the corners of each simplex
+        normals (array): M-by-d array of normals to the hyperplanes of the simplices
+        points (array): M-by-d array, one point for each simplex
+
+    Returns:
+        M-by-d array of the weights of the corners, which sum to one, they are all non-negative for points
+        inside the simplex
+    """
+
+    n_dims = corners.shape[2]
+
+    # Solve for the weights of the edges from the first corner, and of the normal (which is zero in the hyperplane),
+    # using the pseudo-inverse so that flat simplices do not cause an error
+    vectors = concatenate((corners[:, 1:, :] - corners[:, :1, :], normals.reshape(-1, 1, n_dims)), axis=1)
+    offsets = (points - corners[:, 0, :]).reshape(-1, 1, n_dims)
+
+    weights = matmul(offsets, pinv(vectors)).reshape(-1, n_dims)[:, :-1]
+
+    return concatenate((1 - weights.sum(axis=1).reshape(-1, 1), weights), axis=1)
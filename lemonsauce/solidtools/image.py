@@ -0,0 +1,48 @@
+""" Access to hyperspectral image cubes on disk, for processing them a tile at a time """
+
+from numpy import memmap, load, dtype as numpy_dtype
+from numpy.lib.format import open_memmap
+
+
+def open_cube(path: str, shape: tuple = None, dtype: str = "float32", offset: int = 0):
+    """ Memory map a hyperspectral image cube
+
+    Args:
+        path (str): A .npy file, or a file of raw data
+        shape (tuple or None): (height, width, number of wavelengths), needed for raw data
+        dtype (str): Data type of raw data
+        offset (int): Number of bytes before the start of raw data
+
+    Returns:
+        read only memory mapped array, of shape (height, width, number of wavelengths)
+    """
+
+    if path.endswith(".npy"):
+        cube = load(path, mmap_mode="r")
+
+    else:
+        if shape is None:
+            raise ValueError("The shape of the cube is needed to read raw data")
+
+        cube = memmap(path, dtype=numpy_dtype(dtype), mode="r", offset=offset, shape=tuple(shape))
+
+    if len(cube.shape) != 3:
+        raise ValueError("Expected a three dimensional (height, width, wavelengths) cube, got shape %s"
+                         % str(cube.shape))
+
+    return cube
+
+
+def open_output(path: str, shape: tuple, dtype: str = "float32"):
+    """ Create a .npy file for the results of processing a cube, memory mapped for writing
+
+    Args:
+        path (str): Filename
+        shape (tuple): Shape of the output
+        dtype (str): Data type of the output
+
+    Returns:
+        writable memory mapped array
+    """
+
+    return open_memmap(path, mode="w+", dtype=numpy_dtype(dtype), shape=tuple(shape))
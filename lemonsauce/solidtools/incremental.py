@@ -0,0 +1,142 @@
+""" Incremental growth of a triangulated convex solid by Minkowski sums with line segments
+
+Adding a line segment [0, g] to a convex solid changes its boundary in a simple way
+
+* Facets facing away from g (normal.g < 0) stay where they are
+* Facets facing towards g (normal.g > 0) are translated by g
+* Facets parallel to g (normal.g = 0) are stretched along g, this cannot be done by moving simplices,
+  so, if there are any, DegenerateGenerators is raised
+* The ridges between these two regions (the silhouette seen from the direction of g) are swept
+  along g, forming prisms that join the two
+
+So, given the triangulated boundary of the current solid, the new boundary can be found exactly,
+without recalculating a convex hull. The only points that need to be added are the copies of the
+silhouette vertices, the other vertices facing g are moved in place. Apart from classifying the
+facets, the work done is proportional to the size of the part of the boundary facing g.
+
+Each prism is triangulated by the "staircase" rule: for a ridge with vertices a_1 < a_2 < ... < a_k
+(ordered by index), and b_i = a_i + g, the simplices are {a_1, ..., a_j, b_j, ..., b_k} for j = 1...k.
+Because the same vertex order is used for every prism, the triangulations agree where prisms meet.
+
+"""
+
+from itertools import combinations
+
+from numpy import array, arange, concatenate, dot, sqrt, sum, lexsort, zeros, ones, sign, all, any, abs, prod
+
+from .hull import HullData
+from .zonotope import generalised_cross, DegenerateGenerators
+
+
+def _region_boundary(simplices: array):
+    """ Find the ridges on the edge of a region of a triangulated boundary
+
+    Inside the region each ridge is shared by two of its simplices, on its edge, they belong to only one.
+
+    Args:
+        simplices: f-by-d array of indices describing the (d-1)-simplices in the region
+
+    Returns:
+        array of the ridges on the edge of the region, with the vertex indices of each in ascending order
+    """
+
+    n_simplices, n_dims = simplices.shape
+
+    ridges = concatenate([simplices[:, list(kept)] for kept in combinations(range(n_dims), n_dims - 1)], axis=0)
+    ridges.sort(axis=1)
+
+    # Sort so that copies of the same ridge are next to each other
+    ridges = ridges[lexsort(ridges.T[::-1]), :]
+    repeated = all(ridges[1:, :] == ridges[:-1, :], axis=1)
+
+    single = ones(len(ridges), dtype=bool)
+    single[1:] &= ~repeated
+    single[:-1] &= ~repeated
+
+    return ridges[single, :]
+
+
+def extend_hull(hull: HullData, generator: array, centre: array, tolerance: float = 1e-10):
+    """ Calculate the boundary of the Minkowski sum of a solid with a line segment
+
+    Args:
+        hull: The boundary of the current solid
+        generator: The vector g, describing the segment [0, g]
+        centre: Any point in the interior of the current solid
+        tolerance: Facets are treated as parallel to g if the cosine of the angle between their normal and g
+            is smaller than this
+
+    Returns:
+        a HullData object for the extended solid
+
+    Raises:
+        DegenerateGenerators: if g is parallel to some of the facets, these would need to be stretched along g,
+            leaving points that are not vertices of the solid in the middle of its faces
+
+    """
+
+    points = hull.points.copy()
+    simplices = hull.simplices
+    equations = hull.equations.copy()
+    n_points, n_dims = points.shape
+
+    length = sqrt(sum(generator**2))
+    cosines = dot(equations[:, :-1], generator) / length
+
+    if any(abs(cosines) <= tolerance):
+        raise DegenerateGenerators("Generators are not in general position, one is parallel to a facet")
+
+    upper = cosines > 0
+
+    # Vertices belonging to both parts are on the silhouette, and need copying,
+    # those that are only in the upper part can just be moved
+    in_upper = zeros(n_points, dtype=bool)
+    in_upper[simplices[upper, :]] = True
+
+    in_lower = zeros(n_points, dtype=bool)
+    in_lower[simplices[~upper, :]] = True
+
+    silhouette = in_upper & in_lower
+    n_copies = sum(silhouette)
+
+    moved = arange(n_points)
+    moved[silhouette] = n_points + arange(n_copies)
+
+    points[in_upper & ~in_lower, :] += generator
+    points = concatenate((points, points[silhouette, :] + generator), axis=0)
+
+    # The upper facets are translated
+    upper_simplices = moved[simplices[upper, :]]
+    equations[upper, -1] -= dot(equations[upper, :-1], generator)
+
+    # Sweep the silhouette ridges along the generator
+    ridges = _region_boundary(simplices[upper, :])
+    swept = moved[ridges]
+
+    prisms = concatenate([concatenate((ridges[:, :j+1], swept[:, j:]), axis=1)
+                          for j in range(n_dims - 1)], axis=0)
+
+    # Each prism lies in a hyperplane containing the ridge and the generator
+    vectors = points[ridges[:, 1:], :] - points[ridges[:, :1], :]
+    vectors = concatenate((vectors, zeros((len(ridges), 1, n_dims)) + generator), axis=1)
+
+    normals = generalised_cross(vectors)
+    norms = sqrt(sum(normals**2, axis=1))
+
+    # If a ridge contains the direction of g, the prism is flat, and has no well defined normal
+    if any(norms <= tolerance * prod(sqrt(sum(vectors**2, axis=2)), axis=1)):
+        raise DegenerateGenerators("Generators are not in general position, one is parallel to a ridge")
+
+    normals /= norms.reshape(-1, 1)
+
+    base = points[ridges[:, 0], :]
+    normals *= sign(sum((base - centre) * normals, axis=1)).reshape(-1, 1)
+    offsets = -sum(base * normals, axis=1)
+
+    prism_equations = concatenate((normals, offsets.reshape(-1, 1)), axis=1)
+    prism_equations = concatenate([prism_equations for _ in range(n_dims - 1)], axis=0)
+
+    simplices = concatenate((simplices[~upper, :], upper_simplices, prisms), axis=0)
+    equations = concatenate((equations[~upper, :], equations[upper, :], prism_equations), axis=0)
+
+    return HullData(points, simplices, equations)
@@ -0,0 +1,336 @@
+""" The faces of all dimensions making up the boundary of a solid, and how they fit together
+
+`FaceLattice` works with the simplices of a triangulated boundary. `PolytopeFaces` works with the true faces of the
+polytope, where coplanar simplices are merged, so that, for example, the faces of a zonohedron are parallelograms
+rather than pairs of triangles.
+"""
+
+from itertools import combinations
+
+from numpy import array, arange, asarray, concatenate, ones, zeros, full, empty, sort, lexsort, diff, cumsum, any, \
+    abs, argmin, eye, cross, arctan2, sum, split, maximum, amax
+from scipy.sparse import csr_matrix, diags, vstack
+from scipy.sparse.csgraph import connected_components
+
+
+def _unique_rows(rows: array):
+    """ Unique rows of an integer array, in lexicographic order, with the index into them for each original row """
+
+    order = lexsort(rows.T[::-1])
+    ordered = rows[order, :]
+
+    new = concatenate(([True], any(diff(ordered, axis=0) != 0, axis=1)))
+
+    inverse = empty(len(rows), dtype=int)
+    inverse[order] = cumsum(new) - 1
+
+    return ordered[new, :], inverse
+
+
+class FaceLattice:
+    def __init__(self, simplices: array, n_points: int):
+        """ All the faces of a triangulated boundary
+
+        Args:
+            simplices (array): The highest dimensional simplices, each row being the indices of their points
+            n_points (int): Number of points that the simplices refer to
+        """
+
+        self.n_points = n_points
+
+        top = asarray(simplices, dtype=int)
+        n_top = top.shape[1] - 1
+
+        # Each level is found from the one above by dropping each vertex in turn, the indices of the results
+        # in the lower level give the incidence matrices
+        self._levels = {n_top: top}
+        self._incidence = {}
+
+        upper = sort(top, axis=1)
+        for dimension in range(n_top - 1, 0, -1):
+            n_upper, n_vertices = upper.shape
+
+            faces = concatenate([upper[:, list(kept)] for kept in combinations(range(n_vertices), n_vertices - 1)])
+            lower, inverse = _unique_rows(faces)
+
+            columns = arange(n_upper).reshape(1, -1).repeat(n_vertices, axis=0).ravel()
+            self._incidence[dimension] = csr_matrix((ones(len(inverse), dtype=int), (inverse, columns)),
+                                                    shape=(len(lower), n_upper))
+
+            self._levels[dimension] = lower
+            upper = lower
+
+        if n_top > 0:
+            self._levels[0] = arange(n_points).reshape(-1, 1)
+            self._incidence[0] = csr_matrix((ones(upper.size, dtype=int),
+                                             (upper.ravel(), arange(len(upper)).repeat(upper.shape[1]))),
+                                            shape=(n_points, len(upper)))
+
+    @property
+    def dimension(self):
+        """ Dimension of the highest dimensional simplices """
+        return max(self._levels)
+
+    def simplices(self, dimension: int):
+        """ Simplices of a given dimension
+
+        Args:
+            dimension (int): 0 for points, 1 for edges, 2 for triangles, etc.
+
+        Returns:
+            array with dimension+1 columns, the rows of which are the indices of the points of each simplex,
+            other than the highest dimensional ones, these are in ascending order
+        """
+
+        if dimension not in self._levels:
+            raise ValueError("There are no simplices of dimension %i, expected 0 to %i" % (dimension, self.dimension))
+
+        return self._levels[dimension]
+
+    def incidence(self, dimension: int):
+        """ Which simplices of a given dimension are part of which simplices of the dimension above
+
+        Args:
+            dimension (int): dimension of the lower simplices
+
+        Returns:
+            sparse (scipy.sparse.csr_matrix) matrix with a row for each simplex of the given dimension and a column
+            for each one in the dimension above, it is one where the lower simplex is part of the upper, zero otherwise
+        """
+
+        if dimension not in self._incidence:
+            raise ValueError("Incidence matrices are for dimensions 0 to %i" % (self.dimension - 1))
+
+        return self._incidence[dimension]
+
+
+def _vertex_matrix(rows: array, n_points: int):
+    """ Sparse matrix with a one for each of the point indices in each row """
+
+    row_indices = arange(len(rows)).repeat(rows.shape[1])
+
+    return csr_matrix((ones(rows.size, dtype=int), (row_indices, rows.ravel())), shape=(len(rows), n_points))
+
+
+def _matching(counts: csr_matrix, required: array):
+    """ Sparse boolean (as integer) matrix that is one where an entry of counts equals the required value for its row """
+
+    counts = counts.tocoo()
+    keep = counts.data == required[counts.row]
+
+    return csr_matrix((ones(keep.sum(), dtype=int), (counts.row[keep], counts.col[keep])), shape=counts.shape)
+
+
+def _padded_rows(vertex_sets: csr_matrix):
+    """ The column indices of the non-zero entries of each row of a sparse matrix, as the rows of an array
+
+    Short rows are padded with their first index, so each padded row is still the same set of points
+    """
+
+    vertex_sets = vertex_sets.tocsr()
+    vertex_sets.sort_indices()
+
+    lengths = diff(vertex_sets.indptr)
+    width = lengths.max() if len(lengths) > 0 else 0
+
+    mask = arange(width).reshape(1, -1) < lengths.reshape(-1, 1)
+
+    rows = empty((len(lengths), width), dtype=int)
+    rows[mask] = vertex_sets.indices
+    rows[~mask] = rows[:, :1].repeat(width, axis=1)[~mask]
+
+    return rows
+
+
+def _plane_groups(equations: array, lattice: FaceLattice, tolerance: float):
+    """ Label the equations so that those for the same plane have the same label
+
+    Simplices are taken to be in the same plane if they are joined by a chain of neighbouring simplices, the equations
+    of which agree to within the tolerance. The simplices of a facet need not be given exactly the same equation
+    (qhull and `incremental.extend_hull` work them out separately), but as only neighbours are compared, distinct
+    facets that are nearly coplanar are not merged unless they meet.
+    """
+
+    ridges = lattice.incidence(lattice.dimension - 1).tocsr()
+    ridges.sort_indices()
+
+    # Pair each simplex with the next one sharing the same ridge
+    ridge_index = arange(ridges.shape[0]).repeat(diff(ridges.indptr))
+    adjacent = ridge_index[:-1] == ridge_index[1:]
+    first, second = ridges.indices[:-1][adjacent], ridges.indices[1:][adjacent]
+
+    coplanar = amax(abs(equations[first, :] - equations[second, :]), axis=1) <= tolerance
+
+    n_simplices = len(equations)
+    graph = csr_matrix((ones(coplanar.sum(), dtype=int), (first[coplanar], second[coplanar])),
+                       shape=(n_simplices, n_simplices))
+
+    n_planes, labels = connected_components(graph, directed=False)
+
+    # Use the equation of the first simplex in each plane
+    representative = empty(n_planes, dtype=int)
+    representative[labels[::-1]] = arange(n_simplices)[::-1]
+
+    return labels, equations[representative, :]
+
+
+class PolytopeFaces:
+    def __init__(self, points: array, equations: array, lattice: FaceLattice, tolerance: float = 1e-10):
+        """ The true faces of a convex polytope, where coplanar simplices of its triangulated boundary are merged
+
+        The facets are made up of neighbouring simplices lying in the same plane. Every simplex of the triangulation
+        lies in a smallest face, which is the intersection of all the facets containing it. The dimension of a face
+        is the length of the longest chain of smaller faces below it, found from which simplices are part of which.
+        This is all worked out from which points are in which facets, so, other than the grouping of the facets,
+        no tolerances are needed, and simplices that are flat (as qhull can give) do not change the result.
+        Points that are not vertices of the polytope (e.g. ones in the middle of an edge) are left out of the faces.
+
+        Args:
+            points (array): The points of the polytope, n_points-by-n_dims
+            equations (array): Equation (normal and offset) of the plane of each of the highest dimensional simplices,
+                in the form used by scipy.spatial.ConvexHull
+            lattice (FaceLattice): The simplices of the triangulated boundary
+            tolerance (float): Largest difference between the equations of neighbouring simplices in the same facet
+        """
+
+        self.points = asarray(points, dtype=float)
+        self.n_points, self.n_dims = self.points.shape
+
+        top = lattice.dimension
+
+        # Facets, as the points in all the simplices sharing a plane
+        labels, planes = _plane_groups(asarray(equations, dtype=float), lattice, tolerance)
+        membership = csr_matrix((ones(len(labels), dtype=int), (labels, arange(len(labels)))),
+                                shape=(len(planes), len(labels)))
+
+        facets = membership.dot(_vertex_matrix(lattice.simplices(top), self.n_points))
+        facets.data[:] = 1
+
+        # The smallest face of the simplices of each dimension, as the points common to all the facets containing them
+        smallest = []
+        for dimension in range(top + 1):
+            simplices = lattice.simplices(dimension)
+
+            containing = _matching(_vertex_matrix(simplices, self.n_points).dot(facets.T),
+                                   ones(len(simplices), dtype=int) * (dimension + 1))
+
+            n_containing = asarray(containing.sum(axis=1)).ravel()
+            smallest.append(_matching(containing.dot(facets), n_containing))
+
+        rows, inverse = _unique_rows(sort(_padded_rows(vstack(smallest)), axis=1))
+        face_index = split(inverse, cumsum([faces.shape[0] for faces in smallest])[:-1])
+
+        # Where a simplex is part of another, its smallest face is part of the other's, so each incidence
+        # between simplices with different smallest faces is a step in a chain of faces
+        steps = []
+        for dimension in range(top):
+            incidence = lattice.incidence(dimension).tocoo()
+            lower, upper = face_index[dimension][incidence.row], face_index[dimension + 1][incidence.col]
+            steps.append((lower[lower != upper], upper[lower != upper]))
+
+        # Chains are no longer than the dimension of the polytope
+        dimensions = zeros(len(rows), dtype=int)
+        for _ in range(top):
+            for lower, upper in steps:
+                maximum.at(dimensions, upper, dimensions[lower] + 1)
+
+        # Only keep the vertices in each face
+        is_vertex = zeros(self.n_points, dtype=bool)
+        is_vertex[rows[dimensions == 0, 0]] = True
+        keep = diags(is_vertex.astype(int), dtype=int, format="csr")
+
+        self.normals = planes[:, :-1]
+        self._vertices = {top: facets.dot(keep)}
+
+        for dimension in range(1, top):
+            self._vertices[dimension] = _vertex_matrix(rows[dimensions == dimension, :], self.n_points).dot(keep)
+
+        self._vertices[0] = keep[is_vertex, :]
+
+        for vertex_sets in self._vertices.values():
+            vertex_sets.eliminate_zeros()
+            vertex_sets.data[:] = 1
+
+    def faces(self, dimension: int):
+        """ Faces of a given dimension
+
+        Args:
+            dimension (int): 0 for vertices, 1 for edges, 2 for polygons, etc.
+
+        Returns:
+            list of arrays of the (ascending) indices of the points in each face
+        """
+
+        vertex_sets = self.vertex_incidence(dimension)
+        vertex_sets.sort_indices()
+
+        return split(vertex_sets.indices, vertex_sets.indptr[1:-1])
+
+    def vertex_incidence(self, dimension: int):
+        """ Which points make up each face of a given dimension
+
+        Args:
+            dimension (int): dimension of the faces
+
+        Returns:
+            sparse (scipy.sparse.csr_matrix) matrix with a row for each face and a column for each point,
+            one where the point is in the face, zero otherwise
+        """
+
+        if dimension not in self._vertices:
+            raise ValueError("There are no faces of dimension %i, expected 0 to %i" % (dimension, self.n_dims - 1))
+
+        return self._vertices[dimension]
+
+    def incidence(self, dimension: int):
+        """ Which faces of a given dimension are part of which faces of the dimension above
+
+        Args:
+            dimension (int): dimension of the lower faces
+
+        Returns:
+            sparse (scipy.sparse.csr_matrix) matrix with a row for each face of the given dimension and a column
+            for each one in the dimension above, it is one where the lower face is part of the upper, zero otherwise
+        """
+
+        if dimension < 0 or dimension >= self.n_dims - 1:
+            raise ValueError("Incidence matrices are for dimensions 0 to %i" % (self.n_dims - 2))
+
+        lower = self._vertices[dimension]
+        sizes = asarray(lower.sum(axis=1)).ravel()
+
+        return _matching(lower.dot(self._vertices[dimension + 1].T), sizes)
+
+    def polygons(self):
+        """ The faces of a three dimensional polytope, with their points in anticlockwise order when viewed
+        from outside
+
+        The faces only contain vertices of the polytope, which are in convex position, so ordering them by angle
+        around their centre gives simple polygons.
+
+        Returns:
+            list of arrays of point indices
+        """
+
+        if self.n_dims != 3:
+            raise ValueError("Polygons are only defined for three dimensional polytopes")
+
+        vertex_sets = self._vertices[2]
+        vertex_sets.sort_indices()
+
+        counts = diff(vertex_sets.indptr)
+        face_index = arange(len(counts)).repeat(counts)
+
+        centres = vertex_sets.dot(self.points) / counts.reshape(-1, 1)
+        offsets = self.points[vertex_sets.indices, :] - centres[face_index, :]
+
+        # Axes in the plane of each face, such that they and the outward normal are right handed
+        normals = self.normals
+        u = cross(normals, eye(3)[argmin(abs(normals), axis=1), :])
+        w = cross(normals, u)
+
+        angles = arctan2(sum(offsets * w[face_index, :], axis=1), sum(offsets * u[face_index, :], axis=1))
+
+        order = lexsort((angles, face_index))
+
+        return split(vertex_sets.indices[order], vertex_sets.indptr[1:-1])
@@ -0,0 +1,216 @@
+""" Lookup tables for approximate vividness
+
+The vividness of a colour, c, is |v| / r(v), where v = c - 1/2 and r(v) is the distance to the boundary in the
+direction of v. This is the gauge function of the solid (about its centre), g(v), which is convex and scales
+with v, so it only needs to be known for one point in each direction.
+
+We tabulate it on the surface of the cube [-1, 1]^d, which is split into 2d faces, each of which is covered
+by a regular grid. For v on the face where |v_k| is largest,
+
+    g(v) = |v_k| g(v / |v_k|)
+
+and g(v / |v_k|) is found by multilinear interpolation on the face. The error is estimated by comparing
+the interpolated and exact values at the centre of every grid cell.
+
+"""
+
+from itertools import product
+
+from numpy import array, zeros, ones, abs, sqrt, sum, argmax, arange, clip, floor, asarray, linspace, \
+    meshgrid, stack, prod, errstate
+
+from .storage import write_container, read_container
+
+
+def _face_points(n_dims: int, coordinates: array):
+    """ Points on the faces of the cube [-1, 1]^d
+
+    Args:
+        n_dims: dimension, d
+        coordinates: positions along each axis of a face
+
+    Returns:
+        array of shape (2d, len(coordinates)^(d-1), d), the points on each face, faces are ordered
+        +x_0, -x_0, +x_1, -x_1, ...
+    """
+
+    if n_dims == 1:
+        # The faces are single points
+        on_face = zeros((1, 0))
+    else:
+        grids = meshgrid(*([coordinates] * (n_dims - 1)), indexing="ij")
+        on_face = stack([grid.ravel() for grid in grids], axis=1)
+
+    points = zeros((2 * n_dims, len(on_face), n_dims))
+    for axis in range(n_dims):
+        others = [i for i in range(n_dims) if i != axis]
+        for side, sign in enumerate((1, -1)):
+            points[2*axis + side, :, axis] = sign
+            points[2*axis + side][:, others] = on_face
+
+    return points
+
+
+def _corner_weights(corner: array, fractions: array):
+    """ Multilinear interpolation weights along each axis for a corner of a grid cell """
+
+    return corner * fractions + (1 - corner) * (1 - fractions)
+
+
+class BoundaryLUT:
+    def __init__(self, table: array, max_error: float = None):
+        """ Lookup table for the vividness of colours in a colour solid, see `ColourSolid.build_boundary_lut`
+
+        Args:
+            table (array): Values of the gauge function on each face of the cube, shape (2d, n, n, ...)
+            max_error (float or None): Estimated maximum relative error in the vividness
+        """
+
+        self.table = table
+        self.max_error = max_error
+
+    @property
+    def n_dims(self):
+        """ Dimension of the colour solid """
+        return self.table.shape[0] // 2
+
+    @property
+    def resolution(self):
+        """ Number of grid points along each axis of each face """
+        return self.table.shape[1] if self.n_dims > 1 else 1
+
+    @classmethod
+    def from_distances(cls, distances, n_dims: int, resolution: int):
+        """ Build a table from a function giving distances to the boundary
+
+        Args:
+            distances: function taking an M-by-d array of colours and returning their M distances to the boundary
+            n_dims (int): dimension of the solid
+            resolution (int): Number of grid points along each axis of each face, at least 2
+
+        Returns:
+            BoundaryLUT object
+        """
+
+        if resolution < 2:
+            raise ValueError("Resolution must be at least 2")
+
+        coordinates = linspace(-1, 1, resolution)
+        points = _face_points(n_dims, coordinates).reshape(-1, n_dims)
+
+        # Scale the points to lie inside the solid, it doesn't matter for the direction
+        directions = 0.5 * points / sqrt(sum(points**2, axis=1)).reshape(-1, 1)
+        gauge = sqrt(sum(points**2, axis=1)) / distances(0.5 + directions)
+
+        table = gauge.reshape((2 * n_dims,) + (resolution,) * (n_dims - 1))
+        lut = cls(table)
+
+        # Check the cell centres
+        if n_dims > 1:
+            centres = _face_points(n_dims, 0.5 * (coordinates[1:] + coordinates[:-1])).reshape(-1, n_dims)
+            directions = 0.5 * centres / sqrt(sum(centres**2, axis=1)).reshape(-1, 1)
+
+            exact = sqrt(sum(centres**2, axis=1)) / distances(0.5 + directions)
+            approximate = lut.vividness_from_colour(0.5 + centres)
+
+            lut.max_error = float(max(abs(approximate / exact - 1)))
+
+        else:
+            lut.max_error = 0.0
+
+        return lut
+
+    def vividness_from_colour(self, colours: array):
+        """ Approximate vividness of colours, by interpolation
+
+        Args:
+            colours (array): M-by-d array of normalised quantum catches (or a single one)
+
+        Returns:
+            array of M vividness values (or a single one)
+        """
+
+        colours = asarray(colours, dtype=float)
+        single = len(colours.shape) == 1
+        if single:
+            colours = colours.reshape(1, -1)
+
+        if colours.shape[1] != self.n_dims:
+            raise ValueError("Expected colours with %i entries" % self.n_dims)
+
+        vectors = colours - 0.5
+        n_colours = len(vectors)
+        rows = arange(n_colours)
+
+        # Find which face each direction goes through, and where on it
+        axes = argmax(abs(vectors), axis=1)
+        scales = abs(vectors[rows, axes])
+        faces = 2 * axes + (vectors[rows, axes] < 0)
+
+        with errstate(invalid="ignore", divide="ignore"):
+            positions = vectors / scales.reshape(-1, 1)
+        positions[scales == 0, :] = 0
+
+        mask = ones(vectors.shape, dtype=bool)
+        mask[rows, axes] = False
+        positions = positions[mask].reshape(n_colours, self.n_dims - 1)
+
+        # Multilinear interpolation on the face
+        n = self.resolution
+        grid_positions = 0.5 * (positions + 1) * (n - 1)
+        lower = clip(floor(grid_positions).astype(int), 0, max(n - 2, 0))
+        fractions = clip(grid_positions - lower, 0, 1)
+
+        flat_table = self.table.reshape(2 * self.n_dims, -1)
+        strides = n ** arange(self.n_dims - 2, -1, -1)
+
+        values = zeros(n_colours)
+        for corner in product((0, 1), repeat=self.n_dims - 1):
+            corner = array(corner, dtype=int)
+            weights = prod(_corner_weights(corner, fractions), axis=1)
+            indices = sum((lower + corner) * strides, axis=1)
+            values += weights * flat_table[faces, indices]
+
+        values *= scales
+
+        return values[0] if single else values
+
+    def boundary_distance(self, colours: array):
+        """ Approximate distance from the centre to the boundary in the direction of colours
+
+        Args:
+            colours (array): M-by-d array of normalised quantum catches (or a single one), not at the centre
+
+        Returns:
+            array of M distances (or a single one)
+        """
+
+        colours = asarray(colours, dtype=float)
+
+        return sqrt(sum((colours - 0.5)**2, axis=-1)) / self.vividness_from_colour(colours)
+
+    def save(self, path: str):
+        """ Save the table, so that it can be memory mapped with `load`
+
+        Args:
+            path (str): Filename
+        """
+
+        write_container(path, {"table": self.table}, {"max_error": self.max_error})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """ Load a table saved with `save`
+
+        Args:
+            path (str): Filename
+            mmap (bool): Memory map the table (read only, shared between processes), rather than reading it
+
+        Returns:
+            BoundaryLUT object
+        """
+
+        arrays, attributes = read_container(path, mmap=mmap)
+
+        return cls(arrays["table"], attributes["max_error"])
+
@@ -0,0 +1,165 @@
+""" Binary mesh file formats (PLY, STL and GLB)
+
+All of these take an n-by-3 array of vertices and a list of faces, each face being the (0 indexed) vertex indices
+going anticlockwise when viewed from outside. Each file is assembled as arrays and written in one go.
+"""
+
+import json
+import struct
+
+from numpy import array, asarray, zeros, concatenate, cross, sqrt, sum, dtype, uint8, ndarray
+
+
+def triangulate(face_list: list):
+    """ Split convex polygonal faces into triangles, as fans from their first vertex
+
+    Args:
+        face_list: A list of the face indices, or an m-by-k array of them
+
+    Returns:
+        Array of triangles, one per row, with the same orientation as the faces
+    """
+
+    triangles = []
+    for size, faces in _faces_by_size(face_list):
+        if size < 3:
+            raise ValueError("Faces must have at least three vertices")
+
+        for i in range(1, size - 1):
+            triangles.append(faces[:, [0, i, i + 1]])
+
+    if len(triangles) == 0:
+        return zeros((0, 3), dtype=int)
+
+    return concatenate(triangles, axis=0)
+
+
+def _faces_by_size(face_list):
+    """ Group faces by the number of vertices they have
+
+    Returns:
+        list of (number of vertices, array of faces with that many vertices)
+    """
+
+    if isinstance(face_list, ndarray) and len(face_list.shape) == 2:
+        return [(face_list.shape[1], face_list)] if len(face_list) > 0 else []
+
+    groups = {}
+    for face in face_list:
+        groups.setdefault(len(face), []).append(face)
+
+    return [(size, array(faces, dtype=int).reshape(-1, size)) for size, faces in groups.items()]
+
+
+def write_ply(vertices: array, face_list: list, filename: str):
+    """ Writes an object specified by vertices and face indices to a binary PLY file
+
+    Args:
+        vertices: A n-by-3 list of vertices
+        face_list: A list of the face indices (0 indexed)
+        filename: Output filename
+
+    """
+
+    vertices = asarray(vertices, dtype="<f4")
+    groups = _faces_by_size(face_list)
+    n_faces = sum([len(faces) for _, faces in groups], dtype=int)
+
+    header = ("ply\n"
+              "format binary_little_endian 1.0\n"
+              "element vertex %i\n"
+              "property float x\n"
+              "property float y\n"
+              "property float z\n"
+              "element face %i\n"
+              "property list uchar int vertex_indices\n"
+              "end_header\n") % (len(vertices), n_faces)
+
+    # Each face is its number of vertices, then the indices
+    face_data = []
+    for size, faces in groups:
+        rows = zeros(len(faces), dtype=dtype([("size", uint8), ("indices", "<i4", (size,))]))
+        rows["size"] = size
+        rows["indices"] = faces
+        face_data.append(rows.tobytes())
+
+    with open(filename, "wb") as fid:
+        fid.write(header.encode("ascii") + vertices.tobytes() + b"".join(face_data))
+
+
+def write_stl(vertices: array, face_list: list, filename: str):
+    """ Writes an object specified by vertices and face indices to a binary STL file
+
+    Args:
+        vertices: A n-by-3 list of vertices
+        face_list: A list of the face indices (0 indexed), polygons are split into triangles
+        filename: Output filename
+
+    """
+
+    vertices = asarray(vertices, dtype=float)
+    triangles = triangulate(face_list)
+
+    corners = vertices[triangles, :]
+
+    normals = cross(corners[:, 1, :] - corners[:, 0, :], corners[:, 2, :] - corners[:, 0, :])
+    lengths = sqrt(sum(normals**2, axis=1)).reshape(-1, 1)
+    normals /= lengths + (lengths == 0)
+
+    rows = zeros(len(triangles), dtype=dtype([("normal", "<f4", (3,)),
+                                              ("vertices", "<f4", (3, 3)),
+                                              ("attributes", "<u2")]))
+    rows["normal"] = normals
+    rows["vertices"] = corners
+
+    header = b"Colour solid exported by lemonsauce".ljust(80, b" ")
+
+    with open(filename, "wb") as fid:
+        fid.write(header + struct.pack("<I", len(triangles)) + rows.tobytes())
+
+
+def _padded(data: bytes, fill: bytes):
+    """ Pad data to a multiple of four bytes """
+    return data + fill * (-len(data) % 4)
+
+
+def write_glb(vertices: array, face_list: list, filename: str):
+    """ Writes an object specified by vertices and face indices to a binary glTF (GLB) file
+
+    Args:
+        vertices: A n-by-3 list of vertices
+        face_list: A list of the face indices (0 indexed), polygons are split into triangles
+        filename: Output filename
+
+    """
+
+    vertices = asarray(vertices, dtype="<f4")
+    indices = triangulate(face_list).astype("<u4").ravel()
+
+    vertex_bytes = _padded(vertices.tobytes(), b"\x00")
+    index_bytes = _padded(indices.tobytes(), b"\x00")
+
+    document = {
+        "asset": {"version": "2.0", "generator": "lemonsauce"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1, "mode": 4}]}],
+        "buffers": [{"byteLength": len(vertex_bytes) + len(index_bytes)}],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": vertices.nbytes, "target": 34962},
+            {"buffer": 0, "byteOffset": len(vertex_bytes), "byteLength": indices.nbytes, "target": 34963}],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": len(vertices), "type": "VEC3",
+             "min": vertices.min(axis=0).tolist() if len(vertices) > 0 else [0, 0, 0],
+             "max": vertices.max(axis=0).tolist() if len(vertices) > 0 else [0, 0, 0]},
+            {"bufferView": 1, "componentType": 5125, "count": len(indices), "type": "SCALAR"}]}
+
+    json_bytes = _padded(json.dumps(document).encode(), b" ")
+    binary_bytes = vertex_bytes + index_bytes
+
+    chunks = (struct.pack("<II", len(json_bytes), 0x4E4F534A) + json_bytes +
+              struct.pack("<II", len(binary_bytes), 0x004E4942) + binary_bytes)
+
+    with open(filename, "wb") as fid:
+        fid.write(struct.pack("<III", 0x46546C67, 2, 12 + len(chunks)) + chunks)
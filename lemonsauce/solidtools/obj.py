@@ -1,4 +1,6 @@
-from numpy import array
+from numpy import array, asarray
+
+from .mesh import _faces_by_size
 
 
 def write_obj(vertices: array, face_list: list, filename: str):
@@ -11,18 +13,14 @@ def write_obj(vertices: array, face_list: list, filename: str):
 
     """
 
-    n_verts = vertices.shape[0]
-    n_faces = len(face_list)
-
-    fid = open(filename, 'w')
+    vertices = asarray(vertices, dtype=float)
 
-    for i in range(n_verts):
-        fid.write("v %g %g %g\n" % (vertices[i, 0], vertices[i, 1], vertices[i, 2]))
+    # Format everything with one string operation per group of faces with the same number of vertices,
+    # rather than a write call per line
+    text = [("v %g %g %g\n" * len(vertices)) % tuple(vertices[:, :3].ravel())]
 
-    for i in range(n_faces):
-        fid.write("f")
-        for index in face_list[i]:
-            fid.write(" %i" % (index+1))
-        fid.write("\n")
+    for size, faces in _faces_by_size(face_list):
+        text.append((("f" + " %i" * size + "\n") * len(faces)) % tuple((faces + 1).ravel()))
 
-    fid.close()
+    with open(filename, 'w') as fid:
+        fid.write("".join(text))
@@ -0,0 +1,160 @@
+""" Reducing the number of generators of a zonotope, with a bound on the error
+
+Replacing a group of generators, S, by their sum, s, replaces the zonotope they generate with
+the line segment [0, s], which it contains. To bound how far apart these are, write each generator
+as g_i = a_i u + p_i, where u is the unit vector in the direction of s and p_i is perpendicular to it.
+A point of the zonotope, sum_i t_i g_i (0 <= t_i <= 1), is then
+
+    (sum_i t_i a_i) u  +  sum_i (t_i - 1/2) p_i
+
+because the p_i sum to zero. The first term lies within the segment, except where some a_i are negative,
+by at most the total of the negative a_i, and the second has length at most 1/2 sum_i |p_i|.
+So the Hausdorff distance between the two is at most
+
+    e(S) = 1/2 sum_i |p_i|  +  sum_i max(0, -a_i)
+
+which is zero when the generators are all parallel. The Hausdorff distance between Minkowski sums
+is at most the sum of that between the parts, so the total error is at most the sum of e(S) over
+all groups.
+
+Groups are formed by repeatedly merging the pair of groups that increases this bound the least,
+for as long as it stays within the required error. Groups need not be of neighbouring wavelengths.
+
+"""
+
+from numpy import array, zeros, ones, sqrt, sum, maximum, arange, argmin, inf, unique, minimum, bincount
+
+
+def _group_error(generators: array, directions: array):
+    """ e(S) for each generator against the unit direction of the group it would be part of
+
+    Args:
+        generators: k-by-n array of generators
+        directions: k-by-n array of unit vectors (or broadcastable to it)
+
+    Returns:
+        array of the contributions of each generator to the error
+    """
+
+    along = sum(generators * directions, axis=-1)
+    perpendicular = generators - along[..., None] * directions
+
+    return 0.5 * sqrt(sum(perpendicular**2, axis=-1)) + maximum(0.0, -along)
+
+
+def _unit(vectors: array):
+    """ Normalise vectors along the last axis, leaving zero vectors as they are """
+
+    lengths = sqrt(sum(vectors**2, axis=-1, keepdims=True))
+    return vectors / maximum(lengths, 1e-300)
+
+
+def grouping_error(generators: array, labels: array):
+    """ Bound on the Hausdorff distance between a zonotope and the one found by summing groups of its generators
+
+    Args:
+        generators: m-by-n array, the rows of which are the generators
+        labels: integer array of length m, generators with the same label are summed
+
+    Returns:
+        the bound on the error
+    """
+
+    labels = unique(labels, return_inverse=True)[1]
+    n_groups = labels.max() + 1
+
+    sums = zeros((n_groups, generators.shape[1]), dtype=float)
+    for i in range(generators.shape[1]):
+        sums[:, i] = bincount(labels, weights=generators[:, i], minlength=n_groups)
+
+    return sum(_group_error(generators, _unit(sums)[labels, :]))
+
+
+def reduce_generators(generators: array, max_error: float, chunk_size: int = 256):
+    """ Sum groups of generators so that the zonotope changes by no more than a given Hausdorff distance
+
+    Args:
+        generators: m-by-n array, the rows of which are the generators
+        max_error: Maximum allowed Hausdorff distance between the original and reduced zonotopes
+        chunk_size: Number of rows of the initial table of merging costs to calculate at a time
+
+    Returns:
+        tuple of (generators, labels, error), the reduced generators (ordered by the first original
+        generator in each group), the group label for each original generator, and the bound on the error
+    """
+
+    n_gens, n_dims = generators.shape
+
+    # Zero length generators can be removed without error, we add them to the nearest group at the end
+    lengths = sqrt(sum(generators**2, axis=1))
+    nonzero = arange(n_gens)[lengths > 0]
+    gens = generators[nonzero, :]
+    n = len(nonzero)
+
+    # Each generator starts in its own group, the cost of merging a pair is the increase in the error bound
+    labels = arange(n)
+    sums = gens.copy()
+    errors = zeros(n, dtype=float)
+    active = ones(n, dtype=bool)
+
+    costs = zeros((n, n), dtype=float)
+    for start in range(0, n, chunk_size):
+        block = gens[start:start+chunk_size, None, :]
+        directions = _unit(block + gens[None, :, :])
+        costs[start:start+chunk_size, :] = _group_error(block, directions) + _group_error(gens[None, :, :], directions)
+
+    costs[arange(n), arange(n)] = inf
+
+    total = 0.0
+    while n > 1:
+        flat = argmin(costs)
+        i, j = divmod(flat, n)
+        i, j = min(i, j), max(i, j)
+
+        if total + costs[i, j] > max_error:
+            break
+
+        # Merge group j into group i
+        total += costs[i, j]
+        errors[i] += errors[j] + costs[i, j]
+        sums[i, :] += sums[j, :]
+        labels[labels == j] = i
+        active[j] = False
+        costs[j, :] = inf
+        costs[:, j] = inf
+
+        # Recalculate the cost of merging the new group with each other one
+        others = arange(n)[active & (arange(n) != i)]
+        if len(others) == 0:
+            break
+
+        directions = _unit(sums[i, :] + sums[others, :])
+
+        members = labels == i
+        merged = sum(_group_error(gens[members, None, :], directions[None, :, :]), axis=0)
+
+        # Generators in the other groups, against the direction of that group merged with i
+        lookup = zeros(n, dtype=int)
+        lookup[others] = arange(len(others))
+        in_others = active[labels] & ~members
+        contributions = _group_error(gens[in_others, :], directions[lookup[labels[in_others]], :])
+        merged += bincount(lookup[labels[in_others]], weights=contributions, minlength=len(others))
+
+        costs[i, others] = merged - errors[i] - errors[others]
+        costs[others, i] = costs[i, others]
+
+    # Relabel groups in order of their first member and add the zero generators back in
+    _, first, group_labels = unique(labels, return_index=True, return_inverse=True)
+    order = first.argsort().argsort()
+    group_labels = order[group_labels]
+
+    all_labels = zeros(n_gens, dtype=int)
+    all_labels[nonzero] = group_labels
+    zero = arange(n_gens)[lengths == 0]
+    all_labels[zero] = group_labels[minimum(nonzero.searchsorted(zero), n-1)]
+
+    reduced = zeros((len(first), n_dims), dtype=float)
+    for k in range(n_dims):
+        reduced[:, k] = bincount(all_labels, weights=generators[:, k], minlength=len(first))
+
+    return reduced, all_labels, total
@@ -1,47 +1,35 @@
-from numpy import array, sum, dot, transpose, reshape
+from numpy import array, sum, dot, transpose, reshape, asarray, minimum, maximum, searchsorted, arange, cumsum, \
+    repeat, argsort, argmin, abs, eye, cross, sqrt, arctan2, lexsort, split, zeros, add, bincount, unique, stack
 from .geom import expand_simplex
 
-def edge_cmp(e1, e2):
-    """ A comparitor which gives a unique ordering to pairs of numbers"""
-    if e1[0] == e2[0]:
-        if e1[1] == e2[1]:
-            return 0
-        else:
-            return 1 if e1[1] > e2[1] else -1
-    else:
-        return 1 if e1[0] > e2[0] else -1
-
 
 def get_edges(simplex_data: array):
     """Extracts edge data from simplex data
 
     Args:
-        simplex_data: n-by-m Array containing m lists of indices of points forming an n-simplex
+        simplex_data: m-by-(n+1) Array containing m lists of indices of points forming an n-simplex
 
     Returns:
-        List of index pairs of edges
+        E-by-2 array of index pairs of edges, each in ascending order, sorted
     """
 
     #
     # Calculate the edges
     #
 
-    n_simps, n_dims_plus_one = simplex_data.shape
-    edge_data = []
-    for i in range(n_simps):
-        edge_data += expand_simplex(simplex_data[i, :])
+    edge_data = expand_simplex(asarray(simplex_data, dtype=int))
+
+    if len(edge_data) == 0:
+        return edge_data.reshape(0, 2)
 
     #
-    # Remove duplicates
+    # Remove duplicates, packing each pair into a single integer so they sort in the same order as the pairs
     #
 
-    edge_data.sort()
-    out_data = edge_data[:1]
-    for i in range(1, len(edge_data)):
-        if edge_cmp(edge_data[i-1], edge_data[i]) != 0:
-            out_data.append(edge_data[i])
+    n = edge_data.max() + 1
+    keys = unique(edge_data[:, 0] * n + edge_data[:, 1])
 
-    return out_data
+    return stack((keys // n, keys % n), axis=1)
 
 
 def slice_solid(points: array, edges: array, z: float, dir=[0, 0, 1]):
@@ -90,5 +78,81 @@ def slice_solid(points: array, edges: array, z: float, dir=[0, 0, 1]):
     return reshape(array(output_data), (len(output_data), points.shape[1]))
 
 
+def edge_crossings(points: array, edges: array, zs: array, levels: array):
+    """ Find where edges cross many levels of a height function (a slice or section)
+
+    The work done is proportional to the number of crossings, not the number of edges times levels
+
+    Args:
+        points: n-by-d array of points
+        edges: E-by-2 array of index pairs to 'points' specifying the edges
+        zs: height of each point
+        levels: heights at which to find the crossings
+
+    Returns:
+        tuple of (crossing points, index of the level each is for)
+    """
+
+    z0 = zs[edges[:, 0]]
+    z1 = zs[edges[:, 1]]
+
+    # Each edge crosses the (sorted) levels between its ends
+    level_order = argsort(levels, kind="stable")
+    sorted_levels = levels[level_order]
+
+    starts = searchsorted(sorted_levels, minimum(z0, z1), side="left")
+    stops = searchsorted(sorted_levels, maximum(z0, z1), side="left")
+    counts = maximum(stops - starts, 0)
+
+    crossing_edges = repeat(arange(len(edges)), counts)
+    offsets = arange(len(crossing_edges)) - repeat(cumsum(counts) - counts, counts)
+    crossing_levels = level_order[starts[crossing_edges] + offsets]
+
+    # Where they cross, by similar triangles
+    ends = edges[crossing_edges, :]
+    z = levels[crossing_levels]
+    f = ((z - z0[crossing_edges]) / (z1[crossing_edges] - z0[crossing_edges])).reshape(-1, 1)
+    crossings = f * points[ends[:, 1], :] + (1 - f) * points[ends[:, 0], :]
+
+    return crossings, crossing_levels
+
+
+def slice_solid_many(points: array, edges: array, levels: array, dir=[0, 0, 1]):
+    """ Slice a 3D shape at many levels along a given direction
+
+    Args:
+        points: list of points describing on the shape
+        edges: list of index pairs to 'points' specifying the edges
+        levels: distances from (0,0,0) at which to slice, as for the z argument of slice_solid
+        dir: direction in which to measure slice (equally, signed vector normal to slice)
+
+    Returns:
+        list with an array for each level, the points where the edges cross it, in order around the slice
+    """
+
+    points = asarray(points, dtype=float)
+    edges = asarray(edges, dtype=int).reshape(-1, 2)
+    levels = asarray(levels, dtype=float).reshape(-1)
+
+    direction = array(dir, dtype=float)
+    zs = dot(points, direction / sum(direction))
+
+    crossings, crossing_levels = edge_crossings(points, edges, zs, levels)
+
+    # Order the points of each slice by angle about its centre, in the plane of the slice
+    counts_per_level = bincount(crossing_levels, minlength=len(levels))
+
+    centres = zeros((len(levels), points.shape[1]))
+    add.at(centres, crossing_levels, crossings)
+    centres /= maximum(counts_per_level, 1).reshape(-1, 1)
+
+    normal = direction / sqrt(sum(direction**2))
+    u = cross(normal, eye(3)[argmin(abs(normal)), :])
+    w = cross(normal, u)
+
+    relative = crossings - centres[crossing_levels, :]
+    angles = arctan2(dot(relative, w), dot(relative, u))
 
+    order = lexsort((angles, crossing_levels))
 
+    return split(crossings[order, :], cumsum(counts_per_level)[:-1])
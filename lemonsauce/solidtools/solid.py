@@ -1,16 +1,39 @@
 import warnings
 
-from numpy import array, zeros, ones, eye, any, concatenate, dot, arange, cross, interp, transpose, sum, sqrt
+from numpy import array, zeros, ones, any, concatenate, dot, arange, cross, transpose, sum, sqrt, \
+    asarray, clip, searchsorted, errstate, unique, add, argsort, bincount, split, cumsum, where, inf, nonzero
+from collections import OrderedDict
 from scipy.optimize import linprog
 from scipy.spatial import ConvexHull
-from .geom import implicit_line, lower_simplex_order, remove_duplicates
+from .geom import hyperplane_basis
 from .obj import write_obj
-
-from .slicer import slice_solid, get_edges
+from .mesh import write_ply, write_stl, write_glb
+
+from .slicer import slice_solid_many, edge_crossings
+from .zonotope import zonotope_hull, zonogon_vertices, DegenerateGenerators, _combine_parallel
+from .incremental import extend_hull
+from .reduction import reduce_generators, grouping_error
+from .cache import cache_directory, cache_key, load_hull, save_hull
+from .storage import write_container, read_container
+from .hull import HullData, ray_facet_intersections, simplex_coordinates
+from .support import support_distances, support_weights, support_sweep
+from .lut import BoundaryLUT
+from .lattice import FaceLattice, PolytopeFaces
+from .image import open_cube, open_output
+from ..spectrumtools.extreme import extreme_spectra
 
 # Maximum number of points that hull calculation can be called on without pausing/warning
 MAX_POINTS = 50
 
+# Methods available for calculating the solid geometry, see ColourSolid.calculate
+calculation_methods = ["zonotope", "incremental", "iterative"]
+
+# Methods available for finding points on the boundary, see ColourSolid.boundary_spectrum
+boundary_solvers = ["support", "lp", "hull"]
+
+# Number of wavelength grids to keep projection matrices for, see ColourSolid.projection
+PROJECTION_CACHE_SIZE = 8
+
 # This is used to interpret errors from scipy.optimize.linprog
 opt_status_lookup = {
     0: "Optimization terminated successfully",
@@ -19,6 +42,38 @@ opt_status_lookup = {
     3: "Problem appears to be unbounded"
 }
 
+def interpolation_projection(x: array, xp: array, curves: array):
+    """ Matrix that interpolates data from one set of points to another, and multiplies it by some curves
+
+    Interpolating a spectrum, f, given at the points xp, to the points x (as numpy.interp does), is a linear
+    map with at most two non-zero entries in each row, so this can be combined with the curves into a single
+    len(xp)-by-d matrix, P, with numpy.interp(x, xp, f) @ curves = f @ P
+
+    Args:
+        x (array): Points at which the curves are given
+        xp (array): Increasing points at which the spectra will be given
+        curves (array): len(x)-by-d array
+
+    Returns:
+        len(xp)-by-d array
+    """
+
+    xp = asarray(xp, dtype=float)
+    x = asarray(x, dtype=float)
+
+    if len(xp) == 1:
+        return sum(curves, axis=0, keepdims=True)
+
+    lower = clip(searchsorted(xp, x, side="right") - 1, 0, len(xp) - 2)
+    fraction = clip((x - xp[lower]) / (xp[lower + 1] - xp[lower]), 0, 1).reshape(-1, 1)
+
+    projection = zeros((len(xp), curves.shape[1]))
+    add.at(projection, lower, (1 - fraction) * curves)
+    add.at(projection, lower + 1, fraction * curves)
+
+    return projection
+
+
 def extend(data: array, point: array):
     """Extends the colour solid in the direction we choose."""
     return concatenate((data, data + point), axis=0)
@@ -41,7 +96,9 @@ def loop(data1d: array):
 
 
 class ColourSolid:
-    def __init__(self, curves: array, wavelengths: array = None, simplify_tolerance: float = 0.05, force_calculate: bool = False):
+    def __init__(self, curves: array, wavelengths: array = None, simplify_tolerance: float = 0.05, force_calculate: bool = False,
+                 method: str = "zonotope", max_error: float = None, cache_dir: str = None,
+                 boundary_solver: str = "support"):
         """ A Colour Solid
 
         Args:
@@ -49,8 +106,22 @@ class ColourSolid:
             wavelengths (array or None): Specify the _wavelengths for the input curves, needed for calculating vividness
             simplify_tolerance (float): Pool groups of wavelength entries that add up to less than this value
             force_calculate (bool): Automatically calculate the values
+            method (str): Default method used to calculate the geometry, see `calculate`
+            max_error (float or None): If specified, rather than pooling neighbouring wavelengths using
+                simplify_tolerance, combine any entries, keeping the geometry within this (Hausdorff) distance
+                of the exact solid. In both cases, a bound on the error is stored in `reduction_error`.
+            cache_dir (str or None): Directory for storing calculated geometry, so that identical solids
+                are only calculated once. Defaults to the LEMONSAUCE_CACHE environment variable, if it is
+                not set, no caching is done.
+            boundary_solver (str): Default method used to find points on the boundary, see `boundary_spectrum`
         """
 
+        if method not in calculation_methods:
+            raise ValueError("Unknown calculation method '%s', expected one of: %s"
+                             % (method, ", ".join(calculation_methods)))
+
+        self.boundary_solver = self._check_solver(boundary_solver)
+
         # Expects a 2D array
         self.base_n_entries, self.n_dims = curves.shape
         self.base_curves = curves.copy()
@@ -65,25 +136,112 @@ class ColourSolid:
         for i in range(self.n_dims):
             self.base_curves[:, i] /= sum(self.base_curves[:, i])
 
-        # Create simplified version, where we take all parts
-        # smaller than the tolerance and add them to the next bit
-        # this will make the calculations much faster
+        if max_error is None:
 
-        current_total = self.base_curves[0, :].copy()
-        simplified_curves = []
-        for i in range(1, self.base_n_entries):
-            if any(current_total > simplify_tolerance):
-                simplified_curves.append(current_total)
-                current_total = self.base_curves[i, :].copy()
-            else:
-                current_total += self.base_curves[i, :]
-        simplified_curves.append(current_total)
+            # Create simplified version, where we take all parts
+            # smaller than the tolerance and add them to the next bit
+            # this will make the calculations much faster
+
+            current_total = self.base_curves[0, :].copy()
+            simplified_curves = []
+            labels = [0]
+            for i in range(1, self.base_n_entries):
+                if any(current_total > simplify_tolerance):
+                    simplified_curves.append(current_total)
+                    current_total = self.base_curves[i, :].copy()
+                else:
+                    current_total += self.base_curves[i, :]
+                labels.append(len(simplified_curves))
+            simplified_curves.append(current_total)
+
+            self.curves = array(simplified_curves)
+            self.reduction_error = grouping_error(self.base_curves, array(labels))
+
+        else:
+
+            # Combine entries that have similar directions, within the error bound
+            self.curves, _, self.reduction_error = reduce_generators(self.base_curves, max_error)
+
+        self.n_points = len(self.curves)
+
+        self.method = method
 
-        self.curves = array(simplified_curves)
-        self.n_points = len(simplified_curves)
+        self._cache_dir = cache_directory(cache_dir)
+        if self._cache_dir is not None:
+            self._cache_keys = {name: cache_key(self.base_curves, wavelengths, simplify_tolerance, max_error, name)
+                                for name in calculation_methods}
+
+        self._reset_derived()
+
+    def _reset_derived(self):
+        """ Declare the geometry and the other things that are worked out from the curves when they are needed """
 
-        # Make sure this is declared
         self._hull_data = None
+        self._support = None
+        self._planes = None
+        self._vertex_data = None
+        self._lattice = None
+        self._polytope = None
+        self._projections = OrderedDict()
+        self._prefix_sums = None
+
+    def save(self, path: str):
+        """ Save the solid to a file, including its geometry (which will be calculated if needed)
+
+        Args:
+            path (str): Filename
+        """
+
+        arrays = {"base_curves": self.base_curves,
+                  "curves": self.curves,
+                  "wavelengths": self._wavelengths}
+
+        if self.n_dims > 1:
+            arrays["points"] = self.points
+            arrays["simplices"] = self.highest_dimension_simplices
+            arrays["equations"] = self.hull_data.equations
+
+        attributes = {"method": self.method,
+                      "boundary_solver": self.boundary_solver,
+                      "reduction_error": float(self.reduction_error)}
+
+        write_container(path, arrays, attributes)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """ Load a solid saved with `save`
+
+        Args:
+            path (str): Filename
+            mmap (bool): Memory map the arrays, rather than reading them. They are read only, and
+                processes loading the same file share the memory used for them.
+
+        Returns:
+            ColourSolid
+        """
+
+        arrays, attributes = read_container(path, mmap=mmap)
+
+        solid = cls.__new__(cls)
+
+        solid.base_curves = arrays["base_curves"]
+        solid.base_n_entries, solid.n_dims = solid.base_curves.shape
+        solid._wavelengths = arrays.get("wavelengths")
+
+        solid.curves = arrays["curves"]
+        solid.n_points = len(solid.curves)
+        solid.reduction_error = attributes["reduction_error"]
+        solid.method = attributes["method"]
+        solid.boundary_solver = attributes.get("boundary_solver", "support")
+
+        solid._cache_dir = None
+        solid._reset_derived()
+
+        if "points" in arrays:
+            points = arrays["points"]
+            solid._hull_data = HullData(points, arrays["simplices"], arrays["equations"], arange(len(points)))
+
+        return solid
 
     @property
     def points(self):
@@ -92,9 +250,7 @@ class ColourSolid:
         if self.n_dims == 1:
             return array([[0], [1]], dtype=float)
 
-        hull = self.hull_data
-
-        return hull.points[hull.vertices, :]
+        return self._geometry[0]
 
     @property
     def highest_dimension_simplices(self):
@@ -111,40 +267,92 @@ class ColourSolid:
 
         """
 
+        if self.n_dims == 1:
+            return zeros((0, 0), dtype=int)
+
+        return self._geometry[1]
+
+    @property
+    def _geometry(self):
+        """ Points and highest dimensional simplices (indexing the points), worked out once for each hull
+
+        Returns:
+            tuple of (points, simplices)
+        """
+
         hull = self.hull_data
 
-        # The hull specifies simplex data in terms of its input points
-        #  we want it in terms of its `vertices` field.
+        if self._vertex_data is None or self._vertex_data[0] is not hull:
 
-        # We have a map from vertex index to points, we need the other way round
-        points_to_verts =  zeros(len(hull.points), dtype=int)
-        for i in range(len(hull.vertices)):
-            points_to_verts[hull.vertices[i]] = i
+            n_vertices = len(hull.vertices)
 
-        return points_to_verts[hull.simplices]
+            if n_vertices == len(hull.points) and (hull.vertices == arange(n_vertices)).all():
+                # Every point is a vertex, in order (as for the zonotope and incremental methods, and loaded
+                # solids), so the hull's arrays can be used as they are, which keeps them memory mapped
+                points = hull.points
+                simplices = hull.simplices
 
-    def simplices(self, dimension: int):
-        """ List of simplices of a given dimension representing the solid's edges/faces/cells/etc for
-        whatever dimension is specified.
+            else:
+                # The hull specifies simplex data in terms of its input points
+                #  we want it in terms of its `vertices` field, so we need a map from points to vertices
+                points_to_verts = zeros(len(hull.points), dtype=int)
+                points_to_verts[hull.vertices] = arange(n_vertices)
 
-        Args:
-            dimension (int): dimension of the simplex required, 1: edges, 2: faces, 3: cells
+                points = hull.points[hull.vertices, :]
+                simplices = points_to_verts[hull.simplices]
+
+            self._vertex_data = (hull, points, simplices)
+
+        return self._vertex_data[1:]
+
+    @property
+    def face_lattice(self):
+        """ The simplices of every dimension making up the boundary of the solid, and the incidence between them
 
         Returns:
-            list of arrays of dimension+1 integers representing the solid's simplices of that dimension
+            FaceLattice object
         """
 
-        return array(self._simplices(dimension))
+        if self.n_dims == 1:
+            raise ValueError("One dimensional solids have no face lattice.")
+
+        hull = self.hull_data
+
+        # Only built when faces or edges are asked for
+        if self._lattice is None or self._lattice[0] is not hull:
+            points, simplices = self._geometry
+            self._lattice = (hull, FaceLattice(simplices, len(points)))
+
+        return self._lattice[1]
 
-    def _simplices(self, dimension: int):
-        """ List of simplices of a given dimension representing the solid's edges/faces/cells/etc for
+    @property
+    def polytope_faces(self):
+        """ The true faces of the solid, where coplanar simplices of the triangulated boundary are merged, so that,
+        for example, the faces of a three dimensional solid are parallelograms and other polygons, not triangles
+
+        Returns:
+            PolytopeFaces object
+        """
+
+        if self.n_dims == 1:
+            raise ValueError("One dimensional solids have no faces.")
+
+        hull = self.hull_data
+
+        if self._polytope is None or self._polytope[0] is not hull:
+            self._polytope = (hull, PolytopeFaces(self.points, hull.equations, self.face_lattice))
+
+        return self._polytope[1]
+
+    def simplices(self, dimension: int):
+        """ Simplices of a given dimension representing the solid's edges/faces/cells/etc for
         whatever dimension is specified.
 
         Args:
             dimension (int): dimension of the simplex required, 1: edges, 2: faces, 3: cells
 
         Returns:
-            list of arrays of dimension+1 integers representing the solid's simplices of that dimension
+            array with a row of dimension+1 integers for each of the solid's simplices of that dimension
         """
 
         # Negative dimensions make little sense
@@ -153,29 +361,18 @@ class ColourSolid:
 
         # Negaive one dimension formally exists in some sense, but is empty
         elif dimension == -1:
-            return [array([])]
+            return array([array([])])
 
         # This is the vertex indices
         elif dimension == 0:
-            return [array([i]) for i in range(len(self.points))]
+            return arange(len(self.points)).reshape(-1, 1)
 
         # If it is equal to or more than the solid that's a problem.
         elif dimension >= self.n_dims:
             raise ValueError("This solid only has simplices of dimension < %i." % self.n_dims)
 
-        # Top level, get the simplices from the _hull_data object via highest_dimension_simplices
-        elif dimension == self.n_dims-1:
-            return list(self.highest_dimension_simplices)
-
-        # Lastly, if the dimension between that of the points and _hull_data's simplices
-        # return a reduced dimension version of the one above
         else:
-            simplex_list = self._simplices(dimension + 1)
-            data = []
-            for simplex in simplex_list:
-                data += lower_simplex_order(simplex)
-
-            return remove_duplicates(data)
+            return self.face_lattice.simplices(dimension)
 
     @property
     def edges(self):
@@ -186,6 +383,16 @@ class ColourSolid:
         """
         return self.simplices(1)
 
+    @property
+    def true_edges(self):
+        """ Index pairs representing the edges of the solid as a polytope, these are the edges of the triangulation
+        that are not diagonals across a face
+
+        Returns:
+            array with a row of two integers for each edge
+        """
+        return array(self.polytope_faces.faces(1), dtype=int).reshape(-1, 2)
+
     @property
     def faces(self):
         """ List of index tripple representing the solid's faces.
@@ -209,15 +416,23 @@ class ColourSolid:
 
     @property
     def hull_data(self):
-        """ Get the ConvexHull object representing the colour solid
+        """ Get the boundary of the colour solid
+
+        This is a scipy.spatial.ConvexHull for the "iterative" method, and a HullData object (see hull.py) for
+        the others, and for solids that are loaded from files or the cache. HullData has the same fields as
+        ConvexHull (`points`, `simplices`, `equations`, `vertices`, `neighbors`, `volume`, `area`, etc.),
+        so either can be used in the same way.
 
         If it is a one dimensional solid, it will return None
 
         """
 
+        if self._hull_data is None and self._cache_dir is not None and self.n_dims > 1:
+            self._hull_data = load_hull(self._cache_dir, self._cache_keys[self.method])
+
         if self._hull_data is None:
 
-            if self.n_points > MAX_POINTS:
+            if self.method == "iterative" and self.n_points > MAX_POINTS:
                 warnings.warn("There are more than %i points in the fractional yield curves (%i). " % (
                 MAX_POINTS, self.n_points) +
                               "\nLarge numbers can result in very long calculations" +
@@ -231,8 +446,30 @@ class ColourSolid:
 
         return self._hull_data
 
-    def calculate(self):
-        """Calculate the solid"""
+    def calculate(self, method: str = None, workers: int = 1):
+        """Calculate the solid
+
+        Args:
+            method (str): "zonotope" enumerates the vertices of the solid directly from the yield curves,
+                "iterative" grows the solid one wavelength at a time, calculating a convex hull at each step,
+                "incremental" also grows the solid, but updates a single convex hull as it goes.
+                Defaults to the method given when the solid was created.
+                If caching is enabled, the result is stored in the cache under this method, even if it falls
+                back to the iterative one.
+            workers (int): Number of processes to split the calculation between (zonotope method only)
+        """
+
+        if method is None:
+            method = self.method
+
+        requested_method = method
+
+        if method not in calculation_methods:
+            raise ValueError("Unknown calculation method '%s', expected one of: %s"
+                             % (method, ", ".join(calculation_methods)))
+
+        if workers > 1 and method != "zonotope":
+            raise ValueError("Only the zonotope method can use more than one worker.")
 
         print("Calculating %i-D solid from %i points (simplified from %i)" %
               (self.n_dims, self.n_points, self.base_n_entries))
@@ -240,6 +477,31 @@ class ColourSolid:
         if self.n_dims == 1:
             return
 
+        if method != "iterative":
+            try:
+                if method == "zonotope":
+                    self._hull_data = zonotope_hull(self.curves, workers=workers)
+
+                else:
+                    self._hull_data = self._calculate_incremental()
+
+            except DegenerateGenerators as e:
+                warnings.warn("Cannot use the %s method (%s), using the iterative method instead." % (method, str(e)))
+                method = "iterative"
+
+        if method == "iterative":
+            self._hull_data = ConvexHull(self._calculate_iterative())
+
+        if self._cache_dir is not None:
+            save_hull(self._cache_dir, self._cache_keys[requested_method], self._hull_data)
+
+    def _calculate_iterative(self):
+        """ Grow the solid by repeated Minkowski sums with each of the curves' entries
+
+        Returns:
+            the points on the hull of the solid
+        """
+
         # Create the initial parallelepiped
         solid_data = zeros((1,self.n_dims), dtype=float)
         for i in range(self.n_dims):
@@ -254,14 +516,93 @@ class ColourSolid:
             if (self.n_points > MAX_POINTS):
                 print(i)
 
-        # Set the data
-        self._hull_data = ConvexHull(solid_data)
+        return solid_data
 
-    def write_obj(self, filename):
-        """Write the solid to a file
+    def _calculate_incremental(self):
+        """ Grow the solid by repeated Minkowski sums with each of the curves' entries, updating a single hull
+
+        Only the part of the boundary facing each new entry is changed, see `incremental.extend_hull`.
+
+        Returns:
+            a HullData object describing the solid
+        """
+
+        # Zero entries do not change the solid
+        curves = self.curves[(self.curves != 0).any(axis=1), :]
+
+        # Create the initial parallelepiped
+        try:
+            hull = zonotope_hull(curves[:self.n_dims, :])
+
+        except ValueError as e:
+            raise DegenerateGenerators(str(e))
+
+        centre = 0.5 * sum(curves[:self.n_dims, :], axis=0)
+
+        # Grow the solid, moving the part of the boundary facing the new entry
+        for i in range(self.n_dims, len(curves)):
+            hull = extend_hull(hull, curves[i, :], centre)
+            centre = centre + 0.5 * curves[i, :]
+
+            # If there is lots of points, print the level
+            if (self.n_points > MAX_POINTS):
+                print(i)
+
+        return hull
+
+    def section(self, normal: array, offsets, in_plane: bool = False, merge: bool = True):
+        """ Sections of the solid by parallel hyperplanes, the points x where dot(normal, x) = offset
+
+        Each section of a d dimensional solid is a (d-1) dimensional convex polytope, the vertices of which
+        are where the hyperplane crosses the edges of the solid.
 
         Args:
-            filename (str): The file to output to
+            normal (array): Normal of the hyperplanes, of length d
+            offsets (float or array): Offset of the hyperplane, or an array of them
+            in_plane (bool): Give the vertices as d-1 coordinates in the hyperplane (with the axes given by
+                geom.hyperplane_basis(normal)), rather than in the space of the solid
+            merge (bool): Use the true edges of the solid, rather than those of its triangulation (which also
+                gives points on the section boundary that are not vertices)
+
+        Returns:
+            array of the vertices of the section, or, for an array of offsets, a list of them, empty
+            where the hyperplane misses the solid
+        """
+
+        if self.n_dims < 2:
+            raise ValueError("Sections are only defined for solids of two or more dimensions.")
+
+        normal = asarray(normal, dtype=float)
+        if normal.shape != (self.n_dims,):
+            raise ValueError("Expected a normal with %i entries" % self.n_dims)
+
+        single = len(asarray(offsets).shape) == 0
+        offsets = asarray(offsets, dtype=float).reshape(-1)
+
+        points = self.points
+        edges = self.true_edges if merge else self.edges
+
+        crossings, crossing_levels = edge_crossings(points, edges, dot(points, normal), offsets)
+
+        if in_plane:
+            crossings = dot(crossings, hyperplane_basis(normal))
+
+        order = argsort(crossing_levels, kind="stable")
+        counts = bincount(crossing_levels, minlength=len(offsets))
+
+        sections = split(crossings[order, :], cumsum(counts)[:-1])
+
+        return sections[0] if single else sections
+
+    def _mesh(self, merge: bool = False):
+        """ Vertices and outward facing faces of a 2D or 3D solid, as used for writing it to files
+
+        Args:
+            merge (bool): For 3D solids, give the true (polygonal) faces rather than triangles
+
+        Returns:
+            tuple of (n-by-3 array of vertices, list of faces), each face being the indices of its
+            vertices going anticlockwise when seen from outside
         """
 
         if self.n_dims == 2:
@@ -277,44 +618,71 @@ class ColourSolid:
             # the face indices are therefore just a list of the indices 0 to n-1
             faces = [[i for i in range(len(verts))]]
 
-            # Now we can write the data
-            write_obj(verts, faces, filename)
+            return verts, faces
+
+        elif self.n_dims == 3 and merge:
+            # Polygons, already ordered so that they face outwards
+            return self.points, self.polytope_faces.polygons()
 
         elif self.n_dims == 3:
-            # Reduce the points to vertices on the hull
-            solid = self.hull_data
-            hull_points = solid.points[solid.vertices, :]
-            simplified_hull = ConvexHull(hull_points)
+            # The points and simplices in terms of them are cached for the hull
+            verts, simplices = self._geometry
 
-            verts = simplified_hull.points
+            # We need to make sure the faces have the correct orientation, the hull's equations give
+            # outward normals, so reverse any triangle that goes the other way round them
+            p1 = verts[simplices[:, 0], :]
+            p2 = verts[simplices[:, 1], :]
+            p3 = verts[simplices[:, 2], :]
 
-            # We need to make sure the faces have the correct orientation
-            # We use the fact that [0.5,0.5,0.5] is always in the middle
-            centre = array([0.5, 0.5, 0.5])
-            faces = []
-            for face in simplified_hull.simplices:
-                i1 = face[0]
-                i2 = face[1]
-                i3 = face[2]
+            normals = cross(p1 - p3, p2 - p3)
+            outward = sum(normals * self.hull_data.equations[:, :3], axis=1) > 0
 
-                p1 = verts[i1, :]
-                p2 = verts[i2, :]
-                p3 = verts[i3, :]
+            faces = where(outward.reshape(-1, 1), simplices, simplices[:, ::-1])
 
-                normal = cross(p1 - p3, p2 - p3)
+            return verts, faces
 
-                if dot(normal, p1-centre) > 0:
-                    faces.append([i1, i2, i3])
-                else:
-                    faces.append([i3, i2, i1])
+        else:
+            raise ValueError("Only 2D and 3D solids can be written to mesh files.")
 
-            # Now we can write the data
-            write_obj(verts, faces, filename)
+    def write_obj(self, filename, merge: bool = False):
+        """Write the solid to a file
 
-        else:
-            raise ValueError("Only 2D and 3D solids can be written to obj files.")
+        Args:
+            filename (str): The file to output to
+            merge (bool): For 3D solids, write the true (polygonal) faces rather than triangles
+        """
+
+        write_obj(*self._mesh(merge), filename)
+
+    def write_ply(self, filename, merge: bool = False):
+        """Write the solid to a binary PLY file
+
+        Args:
+            filename (str): The file to output to
+            merge (bool): For 3D solids, write the true (polygonal) faces rather than triangles
+        """
+
+        write_ply(*self._mesh(merge), filename)
+
+    def write_stl(self, filename):
+        """Write the solid to a binary STL file
+
+        Args:
+            filename (str): The file to output to
+        """
+
+        write_stl(*self._mesh(), filename)
+
+    def write_glb(self, filename):
+        """Write the solid to a binary glTF (GLB) file
+
+        Args:
+            filename (str): The file to output to
+        """
+
+        write_glb(*self._mesh(), filename)
 
-    def vividness(self, reflectance: array, wavelengths: array = None):
+    def vividness(self, reflectance: array, wavelengths: array = None, solver: str = None):
         """ Calculate the vividness of a given reflectance spectrum using this solid
 
         If _wavelengths are given, the reflectance will be linearly interpolated using them,
@@ -324,6 +692,7 @@ class ColourSolid:
         Args:
             reflectance (array): 1D array of reflectance values
             wavelengths (array): 1D array of _wavelengths or None
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
 
         Returns:
             the vividness of the reflectance according to this visual system
@@ -331,7 +700,78 @@ class ColourSolid:
 
         colour = self.colour(reflectance, wavelengths)
 
-        return self.vividness_from_colour(colour)
+        return self.vividness_from_colour(colour, solver)
+
+    def vividness_many(self, reflectances: array, wavelengths: array = None, solver: str = None):
+        """ Calculate the vividness of many reflectance spectra, see `vividness`
+
+        Args:
+            reflectances (array): M-by-N array, each row of which is a reflectance spectrum
+            wavelengths (array): 1D array of the N _wavelengths of the spectra, or None
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
+
+        Returns:
+            array of M vividness values (nan for spectra at the centre of the solid, as for `vividness`)
+        """
+
+        return self._vividness_many(self.colour_many(reflectances, wavelengths), solver)
+
+    def vividness_image(self, cube, wavelengths: array = None, output=None, tile_pixels: int = 65536,
+                        dtype: str = "float64", solver: str = None):
+        """ Calculate the vividness of every pixel of a hyperspectral image, a tile at a time
+
+        Only one tile of the image is in memory at once, so, with a memory mapped cube (see `image.open_cube`)
+        and output, this can be used for images that are too big to load.
+
+        Args:
+            cube (array or str): height-by-width-by-wavelengths array, or the filename of a .npy file containing one
+            wavelengths (array or None): Wavelengths of the cube, if they differ from those of the solid
+            output (array, str or None): Array to write the results to, or the filename of a .npy file to create,
+                by default, a new array is created
+            tile_pixels (int): Approximate number of pixels to work on at once
+            dtype (str): Data type for the resampling and quantum catch calculations, and for new outputs,
+                "float32" is faster and uses half the memory
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
+
+        Returns:
+            height-by-width array of vividness values
+        """
+
+        if isinstance(cube, str):
+            cube = open_cube(cube)
+
+        height, width, n_wavelengths = cube.shape
+
+        if output is None:
+            output = zeros((height, width), dtype=dtype)
+
+        elif isinstance(output, str):
+            output = open_output(output, (height, width), dtype)
+
+        elif output.shape != (height, width):
+            raise ValueError("Expected output to have shape %s, got %s" % (str((height, width)), str(output.shape)))
+
+        rows_per_tile = max(1, tile_pixels // max(1, width))
+
+        for start in range(0, height, rows_per_tile):
+            tile = asarray(cube[start:start+rows_per_tile, :, :], dtype=dtype)
+            n_rows = tile.shape[0]
+
+            colours = self.colour_many(tile.reshape(-1, n_wavelengths), wavelengths, dtype=dtype)
+            output[start:start+n_rows, :] = self._vividness_many(colours, solver).reshape(n_rows, width)
+
+        if hasattr(output, "flush"):
+            output.flush()
+
+        return output
+
+    def _vividness_many(self, colours: array, solver: str):
+        """ Vividness of an M-by-d array of colours """
+
+        colours = asarray(colours, dtype=float)
+
+        with errstate(invalid="ignore"):
+            return sqrt(sum((colours - 0.5)**2, axis=1)) / self.boundary_distance_many(colours, solver)
 
     def colour(self, reflectance: array, wavelengths: array = None):
         """ Calculate normalised (fractional) quantum catches of a given reflectance.
@@ -354,7 +794,8 @@ class ColourSolid:
                     "Reflectance should have the same number of entries as the curves (%i should be %i)"
                     % (len(reflectance), self.base_n_entries))
 
-            r = reflectance
+            # Use the checked reflectance value to calculate the fractional catches
+            return dot(reflectance, self.base_curves)
 
         else:
             if self._wavelengths is None:
@@ -363,35 +804,155 @@ class ColourSolid:
                                  "avoid the interpolation attempt, do not specify them when"
                                  "calling Solid.vividness.")
 
-            # convert to this objects built in wavelengths
-            r = interp(self.wavelengths, wavelengths, reflectance)
+            # interpolate to this objects built in wavelengths and calculate the catches in one go
+            return dot(reflectance, self.projection(wavelengths))
+
+    def colour_many(self, reflectances: array, wavelengths: array = None, dtype: str = None):
+        """ Calculate normalised (fractional) quantum catches for many reflectances, see `colour`
+
+        Args:
+            reflectances (array): M-by-N array, each row of which is a reflectance spectrum
+            wavelengths (array): 1D array of the N _wavelengths of the spectra, or None
+            dtype (str or None): Data type to do the calculation in, e.g. "float32", by default,
+                that of the reflectances or the curves, whichever is more precise
+
+        Returns:
+            M-by-d array of normalised quantum catches
+        """
+
+        reflectances = asarray(reflectances, dtype=dtype)
+
+        if len(reflectances.shape) != 2:
+            raise ValueError("Expected parameter 'reflectances' to be a 2D array.")
+
+        if wavelengths is None:
+            if reflectances.shape[1] != self.base_n_entries:
+                raise ValueError(
+                    "Reflectances should have the same number of entries as the curves (%i should be %i)"
+                    % (reflectances.shape[1], self.base_n_entries))
+
+            curves = self.base_curves if dtype is None else self.base_curves.astype(dtype)
+
+        else:
+            # projection checks that the solid has wavelengths to interpolate with
+            curves = self.projection(wavelengths, dtype)
+
+        return dot(reflectances, curves)
+
+    def colour_from_transitions(self, one_first: bool, transitions):
+        """ Calculate normalised (fractional) quantum catches of an extreme spectrum, see `extreme_spectrum`,
+        given at the wavelengths of the solid
+
+        Args:
+            one_first (bool): Does the reflectance start with one (true) or zero (false)
+            transitions (list of float): Points at which the spectrum changes between zero and one, or vice-versa
+
+        Returns:
+            an array containing normalised quantum catches
+        """
+
+        return self.colours_from_transitions(one_first, array(transitions, dtype=float).reshape(1, -1))[0, :]
+
+    def colours_from_transitions(self, one_first, transitions: array):
+        """ Calculate normalised (fractional) quantum catches of many extreme spectra, see `extreme_spectra`
+
+        The catches for a block of wavelengths where the reflectance is one are the difference of two entries in a
+        table of cumulative sums of the curves, so the time taken depends on the number of transitions, not the
+        number of wavelengths.
+
+        Args:
+            one_first (bool or array): Do the reflectances start with one (true) or zero (false), for all of them,
+                or one value for each
+            transitions (array): M-by-k array, each row being the points at which a spectrum changes
+
+        Returns:
+            M-by-d array of normalised quantum catches
+        """
+
+        if self._wavelengths is None:
+            raise ValueError("No _wavelengths in Solid._wavelengths to place the transitions with, "
+                             "specify some when the solid is constructed.")
+
+        start, indices = extreme_spectra(self._wavelengths, one_first, transitions, compact=True)
+
+        # The spectrum is constant between consecutive boundaries, starting with the start value and alternating
+        n_spectra, n_transitions = indices.shape
+        boundaries = concatenate((zeros((n_spectra, 1), dtype=int),
+                                  indices,
+                                  self.base_n_entries * ones((n_spectra, 1), dtype=int)), axis=1)
+
+        is_one = start.reshape(-1, 1) ^ (arange(n_transitions + 1) % 2 == 1).reshape(1, -1)
+
+        table = self._cumulative_curves
+        blocks = table[boundaries[:, 1:], :] - table[boundaries[:, :-1], :]
+
+        return sum(blocks * is_one.reshape(n_spectra, -1, 1), axis=1)
+
+    @property
+    def _cumulative_curves(self):
+        """ Cumulative sums of the rows of the curves, the i-th row being the sum of the first i """
+
+        if self._prefix_sums is None:
+            self._prefix_sums = concatenate((zeros((1, self.n_dims)), cumsum(self.base_curves, axis=0)), axis=0)
+
+        return self._prefix_sums
+
+    def projection(self, wavelengths: array, dtype: str = None):
+        """ Matrix that calculates catches directly from spectra given at other wavelengths
+
+        This combines linear interpolation (as numpy.interp) to the wavelengths of the solid with the quantum
+        catch calculation. The matrices for the most recently used wavelength grids are cached.
+
+        Args:
+            wavelengths (array): Increasing wavelengths at which spectra will be given
+            dtype (str or None): Data type of the matrix, defaults to that of the curves
+
+        Returns:
+            len(wavelengths)-by-d array, P, the catches for a spectrum, f, are f @ P
+        """
+
+        if self._wavelengths is None:
+            raise ValueError("No _wavelengths in Solid._wavelengths to interpolate with, "
+                             "specify some when the solid is constructed.")
 
-        # Use the checked/calculated reflectance value to calculate the fractional catches
-        catches = [dot(r, self.base_curves[:, i]) for i in range(self.n_dims)]
+        wavelengths = asarray(wavelengths, dtype=float)
+        key = (wavelengths.tobytes(), str(dtype))
 
-        return array(catches)
+        if key in self._projections:
+            self._projections.move_to_end(key)
 
-    def vividness_from_colour(self, colour):
+        else:
+            projection = interpolation_projection(self.wavelengths, wavelengths, self.base_curves)
+            self._projections[key] = projection if dtype is None else projection.astype(dtype)
+
+            if len(self._projections) > PROJECTION_CACHE_SIZE:
+                self._projections.popitem(last=False)
+
+        return self._projections[key]
+
+    def vividness_from_colour(self, colour, solver: str = None):
         """ Calculate the vividness for normalised quantum catches,
-        this uses a linear programming approach to find the points on the edge.
+        this is its distance from the centre, relative to that of the boundary in the same direction.
 
         Args:
             colour: an array of the normalised quantum catches representing a colour
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
 
         Returns:
             the vividness of the colour
         """
 
         d1 = sqrt(sum((colour-0.5)**2))
-        d2 = self.boundary_distance(colour)
+        d2 = self.boundary_distance(colour, solver)
 
         return d1 / d2
 
-    def boundary_distance(self, colour: array):
+    def boundary_distance(self, colour: array, solver: str = None):
         """ Calculate distance for the centre of the solid to the boundary in the direction of a given colour
 
         Args:
-            A colour for which the corresponding boundary point is to be found
+            colour (array): A colour for which the corresponding boundary point is to be found
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
 
         Returns:
             the distance to the boundary in the direction of the given colour
@@ -401,32 +962,302 @@ class ColourSolid:
         if sum(abs(colour - 0.5)) == 0:
             return 0.0
 
-        boundary = self.boundary_colour(colour)
+        boundary = self.boundary_colour(colour, solver)
         return sqrt(sum((boundary - 0.5)**2))
 
-    def boundary_colour(self, colour: array):
+    def boundary_distance_many(self, colours: array, solver: str = None, chunk_size: int = 4096):
+        """ Calculate the distance from the centre of the solid to the boundary in the direction of many colours
+
+        Args:
+            colours (array): M-by-d array of colours
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
+            chunk_size (int): Maximum number of colours to work on at once with the support solver,
+                its memory use is proportional to this times the number of entries in the curves
+
+        Returns:
+            array of M distances (zero for colours at the centre)
+        """
+
+        colours = asarray(colours, dtype=float)
+
+        if len(colours.shape) != 2 or colours.shape[1] != self.n_dims:
+            raise ValueError("Expected parameter 'colours' to be an M-by-%i array." % self.n_dims)
+
+        directions = colours - 0.5
+        lengths = sqrt(sum(directions**2, axis=1))
+
+        distances = zeros(len(colours))
+        remaining = arange(len(colours))[lengths > 0]
+
+        solver = self._check_solver(solver)
+
+        if solver == "hull" and self.n_dims > 1:
+            distances[remaining], _ = self.boundary_facets(colours[remaining, :])
+            return distances
+
+        if solver != "lp":
+            generators, _ = self.support_generators
+
+            failed = []
+            for start in range(0, len(remaining), chunk_size):
+                chunk = remaining[start:start+chunk_size]
+                t, success = support_distances(generators, directions[chunk, :])
+
+                distances[chunk] = t * lengths[chunk]
+                failed.append(chunk[~success])
+
+            remaining = concatenate(failed) if len(failed) > 0 else remaining[:0]
+
+        # Use the linear programming method for anything left over
+        if len(remaining) > 0:
+            boundaries = dot(self._boundary_spectra_lp(colours[remaining, :] - 0.5), self.base_curves)
+            distances[remaining] = sqrt(sum((boundaries - 0.5)**2, axis=1))
+
+        return distances
+
+    def boundary_colour(self, colour: array, solver: str = None):
         """ Calculate the boundary colour associated with a point in the solid
 
         Args:
             colour (array): a point in the solid
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
 
         Returns:
             the corresponding colour on the boundary of the solid
         """
 
-        return self.colour(self.boundary_spectrum(colour))
+        self._check_colour(colour)
+
+        solver = self._check_solver(solver)
+
+        if solver == "hull" and self.n_dims > 1:
+            distance, _ = self.boundary_facets(colour.reshape(1, -1))
+            return 0.5 + distance[0] * (colour - 0.5) / sqrt(sum((colour - 0.5)**2))
+
+        if solver != "lp":
+            generators, _ = self.support_generators
+            t, success = support_distances(generators, (colour - 0.5).reshape(1, -1))
 
-    def boundary_spectrum(self, colour: array):
+            if success[0]:
+                return 0.5 + t[0] * (colour - 0.5)
+
+        return self.colour(self._boundary_spectrum_lp(colour))
+
+    def boundary_spectrum(self, colour: array, solver: str = None):
         """ Calculate a spectrum on the boundary of the solid in the direction of a specified catch
 
         Args:
             colour (array): A point in the direction for which we want the boundary spectrum
+            solver (str or None): "support" uses the support function of the solid (see `support`),
+                which is much faster, falling back to the linear programming method if its result cannot be
+                verified, "lp" solves a linear programming problem directly. "hull" intersects the ray with the
+                facets of the calculated geometry (see `boundary_facets`), which is fastest for many colours,
+                but is only as accurate as the simplified curves. It cannot give spectra, so here, it is treated
+                the same as "support". Defaults to the solver given when the solid was created.
 
         Returns:
             an array describing the extreme spectrum, its length matches the fractional yield functions'.
 
         """
 
+        self._check_colour(colour)
+
+        if self._check_solver(solver) != "lp":
+            generators, labels = self.support_generators
+            _, weights, success = support_weights(generators, (colour - 0.5).reshape(1, -1))
+
+            if success[0]:
+                return self._spectra_from_weights(weights)[0, :]
+
+        return self._boundary_spectrum_lp(colour)
+
+    def boundary_sweep(self, directions: array, solver: str = None):
+        """ Find the boundary of the solid in a sequence of directions from its centre, e.g. to trace its outline
+
+        With the support solver, each search starts from the result for the previous direction, so when
+        neighbouring directions are close, very little work is needed for each.
+
+        Args:
+            directions (array): M-by-d array of (non-zero) directions from the centre
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
+
+        Returns:
+            tuple of (colours, spectra), M-by-d array of boundary colours, and M-by-N array of the spectra giving them
+        """
+
+        directions = asarray(directions, dtype=float)
+
+        if len(directions.shape) != 2 or directions.shape[1] != self.n_dims:
+            raise ValueError("Expected parameter 'directions' to be an M-by-%i array." % self.n_dims)
+
+        if any(sum(abs(directions), axis=1) == 0):
+            raise ValueError("Directions must be non-zero.")
+
+        spectra = zeros((len(directions), self.base_n_entries))
+        remaining = arange(len(directions))
+
+        if self._check_solver(solver) != "lp":
+            generators, _ = self.support_generators
+            _, weights, success = support_sweep(generators, directions)
+
+            spectra[success, :] = self._spectra_from_weights(weights[success, :])
+            remaining = remaining[~success]
+
+        if len(remaining) > 0:
+            spectra[remaining, :] = self._boundary_spectra_lp(directions[remaining, :])
+
+        return dot(spectra, self.base_curves), spectra
+
+    def _spectra_from_weights(self, weights: array):
+        """ Convert weights for `support_generators` into spectra """
+
+        _, labels = self.support_generators
+
+        spectra = zeros((len(weights), self.base_n_entries))
+        spectra[:, labels >= 0] = weights[:, labels[labels >= 0]]
+
+        return spectra
+
+    def build_boundary_lut(self, resolution: int = 65, solver: str = None):
+        """ Tabulate the distance to the boundary over all directions, for fast approximate vividness calculations
+
+        The table has the same values for any solid with the same curves, so it can be saved and shared
+        between processes (see `BoundaryLUT.save` and `BoundaryLUT.load`).
+
+        Args:
+            resolution (int): Number of points along each axis of the table, it has 2d * resolution^(d-1) entries
+            solver (str or None): Method used to find the boundary, see `boundary_spectrum`
+
+        Returns:
+            BoundaryLUT object, with an estimate of its maximum relative error in `max_error`
+        """
+
+        return BoundaryLUT.from_distances(lambda colours: self.boundary_distance_many(colours, solver),
+                                          self.n_dims, resolution)
+
+    def boundary_facets(self, colours: array, chunk_size: int = None):
+        """ Intersect rays from the centre of the solid, through the given colours, with the facets of its geometry
+
+        The geometry is calculated from the simplified curves, so the results can differ from the
+        other methods by up to `reduction_error`.
+
+        Args:
+            colours (array): M-by-d array of colours, none of which can be at the centre
+            chunk_size (int or None): Number of colours to work on at once, see `hull.ray_facet_intersections`
+
+        Returns:
+            tuple of (distances, facets), the distances from the centre to the boundary, and the index of
+            the simplex (in `highest_dimension_simplices`) where the ray meets it
+        """
+
+        colours = asarray(colours, dtype=float)
+
+        if len(colours.shape) != 2 or colours.shape[1] != self.n_dims:
+            raise ValueError("Expected parameter 'colours' to be an M-by-%i array." % self.n_dims)
+
+        if self.n_dims == 1:
+            raise ValueError("One dimensional solids have no facets.")
+
+        directions = colours - 0.5
+        lengths = sqrt(sum(directions**2, axis=1))
+
+        if any(lengths == 0):
+            raise ValueError("Cannot find the boundary in the direction of the centre of the solid.")
+
+        planes, _, _ = self._facet_planes
+
+        t, facets = ray_facet_intersections(planes, 0.5 * ones(self.n_dims), directions, chunk_size)
+
+        return t * lengths, self._hit_simplices(0.5 + t.reshape(-1, 1) * directions, facets)
+
+    def _hit_simplices(self, hits: array, facets: array):
+        """ Find which of the simplices lying in the given facets contains each point
+
+        Each point is tested against the k-th simplex of its facet for k = 0, 1, ..., and the one it is furthest
+        inside (with the largest smallest barycentric coordinate) is chosen, so points on the edges of simplices,
+        or slightly outside because of rounding, still get one.
+
+        Args:
+            hits (array): M-by-d array of points on the boundary
+            facets (array): Index (in the planes of `_facet_planes`) of the facet each point is on
+
+        Returns:
+            array of indices of simplices (in `highest_dimension_simplices`)
+        """
+
+        hull = self.hull_data
+        planes, order, starts = self._facet_planes
+
+        counts = starts[facets + 1] - starts[facets]
+
+        best = zeros(len(hits), dtype=int)
+        margins = zeros(len(hits)) - inf
+
+        for k in range(counts.max() if len(counts) > 0 else 0):
+            active = nonzero(counts > k)[0]
+            candidates = order[starts[facets[active]] + k]
+
+            corners = hull.points[hull.simplices[candidates, :], :]
+            margin = simplex_coordinates(corners, planes[facets[active], :-1], hits[active, :]).min(axis=1)
+
+            better = margin > margins[active]
+            best[active[better]] = candidates[better]
+            margins[active[better]] = margin[better]
+
+        return best
+
+    @property
+    def _facet_planes(self):
+        """ The distinct hyperplanes of the facets of the solid, each of which is shared between several simplices
+
+        Returns:
+            tuple of (equations, order, starts), the simplices lying in the i-th plane are
+            order[starts[i]:starts[i+1]]
+        """
+
+        hull = self.hull_data
+
+        if self._planes is None or self._planes[0] is not hull:
+            planes, labels = unique(hull.equations, axis=0, return_inverse=True)
+            labels = labels.reshape(-1)
+
+            order = argsort(labels, kind="stable")
+            starts = concatenate(([0], cumsum(bincount(labels, minlength=len(planes)))))
+
+            self._planes = (hull, planes, order, starts)
+
+        return self._planes[1:]
+
+    @property
+    def support_generators(self):
+        """ The entries of the yield curves with zero entries removed and parallel ones combined, as used
+        by the support function boundary solver.
+
+        Returns:
+            tuple of (generators, labels), where labels gives the index of the generator each entry contributes
+            to (or -1 for zero entries)
+        """
+
+        if self._support is None:
+            self._support = _combine_parallel(self.base_curves)
+
+        return self._support
+
+    def _check_solver(self, solver: str):
+        """ Check the name of a boundary solver, getting the default if it is None """
+
+        if solver is None:
+            solver = self.boundary_solver
+
+        if solver not in boundary_solvers:
+            raise ValueError("Unknown boundary solver '%s', expected one of: %s"
+                             % (solver, ", ".join(boundary_solvers)))
+
+        return solver
+
+    def _check_colour(self, colour: array):
+        """ Check that a colour can be used to specify a direction from the centre of the solid """
+
         if sum(abs(colour - 0.5)) == 0:
             raise ValueError("Cannot get explicit boundary spectrum for centre of solid.")
 
@@ -436,26 +1267,51 @@ class ColourSolid:
         if self.n_dims != len(colour):
             raise ValueError("Expected parameter 'colour' to have %i entries" % self.n_dims)
 
+    def _boundary_spectrum_lp(self, colour: array):
+        """ Calculate a spectrum on the boundary of the solid using linear programming, see `boundary_spectrum` """
+
+        return self._boundary_spectra_lp((colour - 0.5).reshape(1, -1))[0, :]
 
-        # set up the standard parameters for the numpy linprog solver
+    def _boundary_spectra_lp(self, directions: array):
+        """ Calculate spectra on the boundary of the solid in many directions using linear programming
 
-        c = -dot(self.base_curves, colour - 0.5)
+        The variables are the spectrum, f, and the distance along the direction, t, the problem is to maximise t
+        subject to f @ curves - t * direction = 0.5, with f between 0 and 1. Only the last column of the
+        constraint matrix depends on the direction, so the matrices are built once and reused for each. The problems
+        are small and dense, so the solver's presolve step costs more than it saves, and is skipped.
 
-        A_ub = concatenate((eye(self.base_n_entries), -eye(self.base_n_entries)))
-        b_ub = concatenate((ones(self.base_n_entries), zeros(self.base_n_entries)))
+        Args:
+            directions (array): M-by-d array of (non-zero) directions from the centre
 
-        linear_constraint_m, linear_constraint_v = implicit_line(0.5 * ones(self.n_dims), colour)
+        Returns:
+            M-by-N array of spectra
+        """
 
-        A_eq = dot(linear_constraint_m, transpose(self.base_curves))
-        b_eq = linear_constraint_v
+        n_entries = self.base_n_entries
 
-        result = linprog(c, A_ub, b_ub, A_eq, b_eq)
+        c = zeros(n_entries + 1)
+        c[-1] = -1
 
-        if result.success:
-            return result.x
+        A_eq = concatenate((transpose(self.base_curves), zeros((self.n_dims, 1))), axis=1)
+        b_eq = 0.5 * ones(self.n_dims)
 
-        else:
-            raise Exception("Optimisation failed: %s"%opt_status_lookup[result.status])
+        bounds = zeros((n_entries + 1, 2))
+        bounds[:, 1] = 1
+        bounds[-1, 1] = inf
+
+        spectra = zeros((len(directions), n_entries))
+
+        for i, direction in enumerate(directions):
+            A_eq[:, -1] = -direction
+
+            result = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, options={"presolve": False})
+
+            if not result.success:
+                raise Exception("Optimisation failed: %s" % opt_status_lookup[result.status])
+
+            spectra[i, :] = result.x[:n_entries]
+
+        return spectra
 
     def draw_yields(self, plt_obj=None, normalise=False, scale: float=1.0, colors: list=None):
         """ Draw the colour solid on a matplotlib object (either given or created on the fly)
@@ -511,23 +1367,64 @@ class ColourSolid:
                 direction: direction perpendicular to which the solid will be slices
         """
 
-        self.draw_on(plt_obj=None, projection=projection, slice=slice, direction=direction, limit=limit)
+        return self.draw_on(plt_obj=None, projection=projection, slice=slice, direction=direction, limit=limit)
 
-    def draw_on(self, plt_obj=None, projection=None, slice: bool=True, direction=(0, 0, 1), limit=True):
+    def projection_outline(self, projection: array = None):
+        """ Outline of a two dimensional projection of the solid
+
+        The projection of the solid is the zonogon generated by the projected yield curves, so
+        this is found directly from them, without calculating the full solid.
+
+        Args:
+            projection (array): An n-by-2 matrix that projects the points of the solid, by default,
+                the first two dimensions are used
+
+        Returns:
+            array of the vertices of the projection, in anticlockwise order
+        """
+
+        if projection is None:
+            projection = zeros((self.n_dims, 2), dtype=float)
+            projection[0, 0] = 1.0
+            projection[1, 1] = 1.0
+        else:
+            projection = asarray(projection, dtype=float)
+
+        if projection.shape != (self.n_dims, 2):
+            raise ValueError("Projection should be an n-by-2 matrix")
+
+        return zonogon_vertices(dot(self.curves, projection))
+
+    def draw_on(self, plt_obj=None, projection=None, slice: bool=True, direction=(0, 0, 1), limit=True,
+                merge: bool=True, n_slices: int=20):
         """ Draw the colour solid on a matplotlib object (either given or created on the fly)
 
+        The slices are drawn as a single PolyCollection, so that solids with many slices draw quickly
+
         Args:
             projection: A two-by-n matrix that turns projects the points of the solid
-            plt_obj: A matplotlib plot object on which to call .plot, if None, we make our own then call show at the end
+            plt_obj: A matplotlib plot object on which to call .plot (pyplot, or a set of axes),
+                if None, we make our own then call show at the end
             slice: If the solid is 3D, show slices in the direction specified by the direction parameter
             direction: direction perpendicular to which the solid will be slices
-            """
+            merge: Slice only the true edges of the solid, not the diagonals of its triangulated faces (which
+                give the same slices, but take longer)
+            n_slices: Number of evenly spaced slices to show
+
+        Returns:
+            list of the matplotlib artists that were added
+        """
 
         if plt_obj is None:
             import matplotlib.pyplot as plt
         else:
             plt = plt_obj
 
+        # Collections have to be added to a set of axes
+        axes = plt.gca() if hasattr(plt, "gca") else plt
+
+        artists = []
+
         #
         # Main plotting part, different routines for different dimensionalities
         #
@@ -535,7 +1432,7 @@ class ColourSolid:
         if self.n_dims == 1:
 
             # Just a line
-            plt.plot([0.5, 0.5], [0.0, 1.0], 'k')
+            artists += plt.plot([0.5, 0.5], [0.0, 1.0], 'k')
 
         else:
 
@@ -552,15 +1449,14 @@ class ColourSolid:
 
 
 
-            s = self.hull_data
-            v = s.vertices
-
             if self.n_dims == 2:
 
                 # No projection needed, just show the outside
+                s = self.hull_data
+                v = s.vertices
                 p = dot(s.points, projection)
                 v = loop(v)
-                plt.plot(p[v, 0], p[v, 1], 'k')
+                artists += plt.plot(p[v, 0], p[v, 1], 'k')
 
             else:
 
@@ -571,47 +1467,48 @@ class ColourSolid:
                         direction = [1, 1, 1]
 
                     # project according to the matrix provided,
-                    # and slice it in the z direction
+                    # and slice it in the z direction,
+                    # the edges are cached, so only the slicing is done for each new direction
 
-                    edges = array(get_edges(s.simplices))
-                    if slice:
-                        print("Slicing 3-D solid...")
-                        k = 0.05
-                        for z in arange(k/2.0, 1.0, k):
+                    points = self.points
+                    edges = self.true_edges if merge else self.edges
 
-                            slice = slice_solid(s.points, array(edges), z, dir=direction)
+                    if slice:
+                        from matplotlib.collections import PolyCollection
 
-                            if slice.shape[0] > 1:
+                        print("Slicing 3-D solid...")
+                        levels = (arange(n_slices) + 0.5) / n_slices
 
-                                solid2D = ConvexHull(dot(slice, projection))
-                                v = loop(solid2D.vertices)
-                                p = solid2D.points
+                        # The slices come back as polygons, with their points in order
+                        polygons = [dot(polygon, projection)
+                                    for polygon in slice_solid_many(points, edges, levels, dir=direction)
+                                    if polygon.shape[0] > 2]
 
-                                plt.fill(p[v, 0], p[v, 1], 'k', alpha=0.1)
-                                plt.plot(p[v, 0], p[v, 1], 'k')
+                        slices = PolyCollection(polygons, facecolors=(0, 0, 0, 0.1), edgecolors="k")
+                        axes.add_collection(slices)
+                        artists.append(slices)
 
                     # main boundary
-                    solid2D = ConvexHull(dot(s.points, projection))
-                    v = loop(solid2D.vertices)
-                    p = solid2D.points
+                    p = self.projection_outline(projection)
+                    v = loop(arange(len(p)))
 
-                    plt.plot(p[v, 0], p[v, 1], 'k')
+                    artists += plt.plot(p[v, 0], p[v, 1], 'k')
 
                 else:
-                    # Just plot the extremities of the solid
-                    prj = dot(s.points, projection)
-                    solid2D = ConvexHull(prj)
-                    v = loop(solid2D.vertices)
-                    p = solid2D.points
+                    # Just plot the extremities of the solid, which doesn't need the full solid to be calculated
+                    p = self.projection_outline(projection)
+                    v = loop(arange(len(p)))
 
-                    plt.plot(p[v, 0], p[v, 1])
+                    artists += plt.plot(p[v, 0], p[v, 1])
 
         #
         # Plot limits
         #
         if limit:
-            plt.xlim([0, 1])
-            plt.ylim([0, 1])
+            axes.set_xlim([0, 1])
+            axes.set_ylim([0, 1])
+        else:
+            axes.autoscale_view()
 
         #
         # Finally, if we created the plot here, show it
@@ -620,4 +1517,6 @@ class ColourSolid:
         if plt_obj is None:
             plt.show()
 
+        return artists
+
 
@@ -0,0 +1,116 @@
+""" Binary container for arrays, laid out so that they can be memory mapped
+
+The file starts with an 8 byte magic string, then the length of a JSON header as an 8 byte little endian integer,
+then the header itself. The header gives the dtype, shape and position of each array, along with any other
+(JSON serialisable) attributes. Each array is stored as raw, C ordered, data, starting on a 64 byte boundary.
+
+"""
+
+import json
+import os
+import struct
+import tempfile
+
+from numpy import array, ascontiguousarray, dtype, memmap, fromfile
+
+MAGIC = b"LEMONSL\x01"
+
+# Arrays start at multiples of this, so they are aligned for any dtype and for vectorised loads
+ALIGNMENT = 64
+
+
+def _aligned(position: int):
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def write_container(path: str, arrays: dict, attributes: dict = None):
+    """ Write arrays to a file
+
+    Args:
+        path (str): Filename
+        arrays (dict): Dictionary of names and arrays, entries that are None are skipped
+        attributes (dict or None): Any other JSON serialisable data to store
+
+    """
+
+    arrays = {name: ascontiguousarray(data) for name, data in arrays.items() if data is not None}
+
+    # Lay out the arrays relative to the end of the header, which isn't known yet
+    position = 0
+    layout = {}
+    for name, data in arrays.items():
+        position = _aligned(position)
+        layout[name] = {"dtype": data.dtype.str, "shape": list(data.shape), "offset": position}
+        position += data.nbytes
+
+    header = {"attributes": {} if attributes is None else attributes, "arrays": layout}
+
+    # Moving the arrays to after the header can make the header longer, so repeat until it fits
+    start = 0
+    while True:
+        shifted = {name: dict(entry, offset=entry["offset"] + start) for name, entry in layout.items()}
+        header_bytes = json.dumps(dict(header, arrays=shifted)).encode()
+        if len(MAGIC) + 8 + len(header_bytes) <= start:
+            break
+        start = _aligned(len(MAGIC) + 8 + len(header_bytes))
+
+    header_bytes += b" " * (start - len(MAGIC) - 8 - len(header_bytes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+
+    # Write to a temporary file and move it into place, so that other processes never see a partial file
+    fid, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fid, "wb") as file:
+            file.write(MAGIC)
+            file.write(struct.pack("<Q", len(header_bytes)))
+            file.write(header_bytes)
+
+            for name, data in arrays.items():
+                file.seek(shifted[name]["offset"])
+                file.write(data.tobytes())
+
+        os.replace(temporary, path)
+
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def read_container(path: str, mmap: bool = True):
+    """ Read arrays from a file written by `write_container`
+
+    Args:
+        path (str): Filename
+        mmap (bool): Memory map the arrays (read only), rather than reading them into memory
+
+    Returns:
+        tuple of (arrays, attributes) dictionaries
+    """
+
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("'%s' is not a lemonsauce data file" % path)
+
+        header_length, = struct.unpack("<Q", file.read(8))
+        header = json.loads(file.read(header_length).decode())
+
+        arrays = {}
+        for name, entry in header["arrays"].items():
+            data_type = dtype(entry["dtype"])
+            shape = tuple(entry["shape"])
+            count = 1
+            for size in shape:
+                count *= size
+
+            if count == 0:
+                arrays[name] = array([], dtype=data_type).reshape(shape)
+
+            elif mmap:
+                arrays[name] = memmap(path, dtype=data_type, mode="r", offset=entry["offset"], shape=shape)
+
+            else:
+                file.seek(entry["offset"])
+                arrays[name] = fromfile(file, dtype=data_type, count=count).reshape(shape)
+
+    return arrays, header["attributes"]
@@ -0,0 +1,351 @@
+""" Finding where rays from the centre of a zonotope leave it, using its support function
+
+For the zonotope generated by the rows b_i of B, with centre c = 1/2 sum_i b_i, the support function is
+h(u) = sum_i max(0, b_i.u), so the supporting hyperplane with normal u is a distance (in units of |u|)
+
+    h(u) - u.c = 1/2 sum_i |b_i.u|
+
+from the centre. The ray c + t v leaves the zonotope through the closest of these, at
+
+    t = min over u, with u.v = 1, of 1/2 |B u|_1
+
+This is a piecewise linear function of u, and its minimum is at a vertex, where d-1 of the b_i.u are zero.
+u is then the normal of the facet the ray leaves through, and the point where it does so is B^T x, with
+
+    x_i = 1 where b_i.u > 0,  x_i = 0 where b_i.u < 0
+
+and the remaining d-1 entries (the active generators) chosen so that B^T x = c + t v. If these are all
+between 0 and 1, then x is a valid spectrum, and as its colour maximises u.y over the solid, it is on the boundary.
+This is a certificate that the answer is correct, when it fails (because of degeneracy or rounding) the caller
+needs to use another method.
+
+To find the minimum, we take a few steps of iteratively reweighted least squares, which gets close to it, and use
+the d-1 generators with the smallest b_i.u to choose a starting vertex. From there, we try releasing each of the
+active generators in turn, and move along the resulting edge to the lowest point on it. The minimum of a convex
+piecewise linear function of one variable is at the weighted median of its breakpoints, so these line searches are
+exact, and each step is O(N log N).
+
+Everything is vectorised over many rays at once.
+
+"""
+
+from numpy import array, zeros, abs, sum, sqrt, maximum, argsort, argpartition, take_along_axis, \
+    cumsum, argmax, arange, einsum, where, inf, isfinite, all, any, clip, eye, dot
+from numpy.linalg import solve, det
+from scipy.optimize import lsq_linear
+
+from .zonotope import generalised_cross
+
+# Tolerance for the active generator weights being within [0, 1]
+CERTIFICATE_TOLERANCE = 1e-9
+
+
+def _append_rows(stack: array, rows: array):
+    """ Append a row to each matrix in a stack """
+
+    n_matrices, n_rows, n_cols = stack.shape
+    output = zeros((n_matrices, n_rows + 1, n_cols))
+    output[:, :n_rows, :] = stack
+    output[:, n_rows, :] = rows
+    return output
+
+
+def _line_search(residuals: array, changes: array):
+    """ Exact minimisation of sum_i |residuals_i + s changes_i| over s, for many lines at once
+
+    Args:
+        residuals: M-by-N array, b_i.u at the current point
+        changes: M-by-N array, b_i.e for the direction of the line, e
+
+    Returns:
+        tuple of (s, index, value), the step to the minimum, the index of the generator whose
+        breakpoint the minimum is at, and the value of the function there
+    """
+
+    # Breakpoints, lines parallel to a generator's hyperplane have none (and zero weight)
+    weights = abs(changes)
+    parallel = weights == 0
+    breakpoints = -residuals / where(parallel, 1.0, changes)
+    breakpoints[parallel] = inf
+
+    order = argsort(breakpoints, axis=1)
+    sorted_weights = take_along_axis(weights, order, axis=1)
+    totals = cumsum(sorted_weights, axis=1)
+
+    # The weighted median, where the slope changes sign
+    median = argmax(totals >= 0.5 * totals[:, -1:], axis=1)
+
+    index = order[arange(len(order)), median]
+    step = breakpoints[arange(len(order)), index]
+    step[~isfinite(step)] = 0.0
+
+    value = sum(abs(residuals + step.reshape(-1, 1) * changes), axis=1)
+
+    return step, index, value
+
+
+def _vertex_normals(generators: array, directions: array, active: array):
+    """ u with b_i.u = 0 for the active generators and u.v = 1
+
+    Returns:
+        tuple of (u, valid), where valid is False where the active generators don't define a vertex
+    """
+
+    normals = generalised_cross(generators[active, :])
+    projections = sum(normals * directions, axis=1)
+
+    scale = sqrt(sum(normals**2, axis=1)) * sqrt(sum(directions**2, axis=1))
+    valid = abs(projections) > 1e-12 * scale
+
+    normals /= where(valid, projections, 1.0).reshape(-1, 1)
+
+    return normals, valid
+
+
+def _active_fractions(generators: array, directions: array, active: array, residuals: array, t: array):
+    """ Weights for the active generators, so that the point is on the ray (see module docstring)
+
+    Returns:
+        tuple of (active weights, how far outside [0, 1] each one is, whether they are a valid certificate)
+    """
+
+    # Solve B_S^T x_S = B^T (1/2 - x) + t v by least squares (there is one more equation than unknown,
+    # but the system is consistent because of how t is chosen), the active residuals are zero
+    targets = 0.5 * sum(generators, axis=0) - dot(residuals > 0, generators) + t.reshape(-1, 1) * directions
+    basis = generators[active, :]
+    gram = einsum("mid,mjd->mij", basis, basis)
+
+    scale = sum(gram[:, arange(gram.shape[1]), arange(gram.shape[1])], axis=1)
+    well_posed = abs(det(gram)) > 1e-24 * scale**gram.shape[1]
+    gram[~well_posed] = eye(gram.shape[1])
+
+    fractions = solve(gram, einsum("mid,md->mi", basis, targets)[..., None])[..., 0]
+
+    mismatch = targets - einsum("mi,mid->md", fractions, basis)
+    consistent = sqrt(sum(mismatch**2, axis=1)) <= 1e-8 * maximum(1.0, sqrt(sum(targets**2, axis=1)))
+
+    violations = maximum(-fractions, fractions - 1)
+    valid = well_posed & consistent & all(violations <= CERTIFICATE_TOLERANCE, axis=1)
+
+    return fractions, violations, valid
+
+
+def _degenerate_weights(generators: array, direction: array, normal: array, t: float, tolerance: float = 1e-9):
+    """ Weights for a single ray, where more than d-1 generators are (nearly) parallel to the facet
+
+    All the generators within the tolerance of being parallel are allowed to take any weight in [0, 1],
+    and these are found by bounded least squares.
+
+    Returns:
+        tuple of (weights for all the generators, whether they give the point on the ray)
+    """
+
+    residuals = dot(generators, normal)
+    scale = sqrt(sum(generators**2, axis=1) * sum(normal**2))
+    free = abs(residuals) <= tolerance * scale
+
+    weights = (residuals > 0).astype(float)
+    weights[free] = 0.0
+
+    target = dot(0.5 - weights, generators) + t * direction
+    result = lsq_linear(generators[free, :].T, target, bounds=(0, 1), method="bvls")
+
+    weights[free] = result.x
+
+    mismatch = sqrt(sum((dot(result.x, generators[free, :]) - target)**2))
+
+    return weights, mismatch <= 1e-8 * maximum(1.0, sqrt(sum(target**2)))
+
+
+def _search(generators: array, directions: array, irls_iterations: int, max_steps: int, active: array = None):
+    """ Find the minimising vertex for each ray, see module docstring
+
+    If `active` is given, the search starts from the vertices given by these sets of d-1 generators,
+    rather than from the least squares approximation.
+
+    Returns:
+        tuple of (t, normals, active, fractions, success, stuck), where stuck indicates rays where no move
+        improves things but the certificate fails, which usually means the vertex is degenerate
+    """
+
+    n_gens, n_dims = generators.shape
+    n_rays = len(directions)
+
+    if active is None:
+
+        # Iteratively reweighted least squares for min |B u|_1 subject to u.v = 1
+        products = (generators[:, :, None] * generators[:, None, :]).reshape(n_gens, n_dims * n_dims)
+        normals = directions / sum(directions**2, axis=1).reshape(-1, 1)
+        for _ in range(irls_iterations):
+            residuals = abs(dot(normals, generators.T))
+            reweighting = 1 / maximum(residuals, 1e-12 * maximum(residuals.max(axis=1, keepdims=True), 1e-300))
+            matrices = dot(reweighting, products).reshape(-1, n_dims, n_dims)
+            normals = solve(matrices, directions[..., None])[..., 0]
+            normals /= sum(normals * directions, axis=1).reshape(-1, 1)
+
+        # Start from the vertex given by the d-1 generators closest to being parallel to the facet
+        lengths = sqrt(sum(generators**2, axis=1))
+        closeness = abs(dot(normals, generators.T)) / lengths
+        active = argpartition(closeness, n_dims - 2, axis=1)[:, :n_dims - 1]
+
+    else:
+        active = active.copy()
+
+    t = zeros(n_rays)
+    final_normals = zeros((n_rays, n_dims))
+    fractions = zeros((n_rays, n_dims - 1))
+    success = zeros(n_rays, dtype=bool)
+    stuck = zeros(n_rays, dtype=bool)
+    pending = arange(n_rays)
+
+    for _ in range(max_steps):
+
+        normals, valid = _vertex_normals(generators, directions[pending], active[pending])
+        residuals = dot(normals, generators.T)
+        residuals[arange(len(pending)).reshape(-1, 1), active[pending]] = 0.0
+        values = sum(abs(residuals), axis=1)
+
+        t[pending] = 0.5 * values
+        fractions[pending], violations, certified = _active_fractions(generators, directions[pending],
+                                                                      active[pending], residuals, t[pending])
+
+        certified &= valid
+        success[pending] = certified
+        final_normals[pending] = normals
+
+        # Move the others towards the minimum
+        moving = ~certified & valid
+        if not any(moving):
+            break
+
+        pending = pending[moving]
+        residuals = residuals[moving]
+        values = values[moving]
+
+        # The weight outside [0, 1] shows which constraint to release, as in the dual simplex method,
+        # if that doesn't lead anywhere (at degenerate vertices) try the others
+        order = argsort(-violations[moving], axis=1)
+        improved = zeros(len(pending), dtype=bool)
+
+        for attempt in range(n_dims - 1):
+            trying = arange(len(pending))[~improved]
+            release = order[trying, attempt]
+
+            kept = active[pending[trying]].copy()
+            kept[arange(len(trying)), release] = kept[:, -1]
+            vectors = _append_rows(generators[kept[:, :-1], :], directions[pending[trying]])
+            edges = generalised_cross(vectors)
+
+            _, index, value = _line_search(residuals[trying], dot(edges, generators.T))
+
+            # Moves that don't change the value are allowed, as long as they change the vertex
+            released = active[pending[trying], release]
+            moved = (value <= values[trying] * (1 + 1e-14)) & (index != released)
+
+            active[pending[trying[moved]], release[moved]] = index[moved]
+            improved[trying[moved]] = True
+
+            if all(improved):
+                break
+
+        stuck[pending[~improved]] = True
+
+        pending = pending[improved]
+        if len(pending) == 0:
+            break
+
+    return t, final_normals, active, fractions, success, stuck
+
+
+def support_distances(generators: array, directions: array, irls_iterations: int = 2, max_steps: int = 100):
+    """ Find where rays from the centre of a zonotope meet its boundary
+
+    Args:
+        generators: N-by-d array of non-zero, non-parallel generators (see `zonotope._combine_parallel`)
+        directions: M-by-d array of ray directions, v, none of which may be zero
+        irls_iterations: number of reweighted least squares steps used to find a starting point
+        max_steps: maximum number of moves between vertices
+
+    Returns:
+        tuple of (t, success), the ray parameter at the boundary (the point is c + t v),
+        and whether the result is certified to be correct
+    """
+
+    t, normals, _, _, success, stuck = _search(generators, directions, irls_iterations, max_steps)
+
+    for i in arange(len(directions))[stuck]:
+        _, success[i] = _degenerate_weights(generators, directions[i], normals[i], t[i])
+
+    return t, success
+
+
+def support_weights(generators: array, directions: array, irls_iterations: int = 2, max_steps: int = 100):
+    """ Find where rays from the centre of a zonotope meet its boundary, and the weights of the generators there
+
+    Args:
+        generators: N-by-d array of non-zero, non-parallel generators (see `zonotope._combine_parallel`)
+        directions: M-by-d array of ray directions, v, none of which may be zero
+        irls_iterations: number of reweighted least squares steps used to find a starting point
+        max_steps: maximum number of moves between vertices
+
+    Returns:
+        tuple of (t, weights, success), the ray parameter at the boundary, an M-by-N array of weights in [0, 1]
+        such that weights @ generators = c + t v, and whether the result is certified to be correct
+    """
+
+    t, normals, active, fractions, success, stuck = _search(generators, directions, irls_iterations, max_steps)
+
+    weights = _weights(generators, directions, t, normals, active, fractions, success, stuck)
+
+    return t, weights, success
+
+
+def support_sweep(generators: array, directions: array, irls_iterations: int = 2, max_steps: int = 100):
+    """ As `support_weights`, but for a sequence of directions, each search starting where the previous one finished
+
+    When neighbouring directions are close, their boundary points are usually on the same or adjacent facets,
+    so only a move or two is needed for each.
+
+    Args:
+        generators: N-by-d array of non-zero, non-parallel generators (see `zonotope._combine_parallel`)
+        directions: M-by-d array of ray directions, v, none of which may be zero
+        irls_iterations: number of reweighted least squares steps used to find a starting point, when there
+            is no previous result to start from
+        max_steps: maximum number of moves between vertices, for each direction
+
+    Returns:
+        tuple of (t, weights, success), see `support_weights`
+    """
+
+    n_rays = len(directions)
+
+    t = zeros(n_rays)
+    weights = zeros((n_rays, len(generators)))
+    success = zeros(n_rays, dtype=bool)
+
+    active = None
+    for i in range(n_rays):
+        direction = directions[i:i+1, :]
+
+        result = _search(generators, direction, irls_iterations, max_steps, active)
+        t[i] = result[0][0]
+        weights[i, :] = _weights(generators, direction, *result)[0]
+        success[i] = result[4][0]
+
+        # Only carry on from results that were found by moving between vertices
+        active = result[2] if success[i] and not result[5][0] else None
+
+    return t, weights, success
+
+
+def _weights(generators: array, directions: array, t: array, normals: array, active: array, fractions: array,
+             success: array, stuck: array):
+    """ Weights of all the generators for the results of `_search`, updating `success` for degenerate vertices """
+
+    weights = (dot(normals, generators.T) > 0).astype(float)
+    weights[arange(len(directions)).reshape(-1, 1), active] = clip(fractions, 0, 1)
+
+    for i in arange(len(directions))[stuck]:
+        weights[i], success[i] = _degenerate_weights(generators, directions[i], normals[i], t[i])
+
+    return weights
@@ -0,0 +1,636 @@
+""" Direct construction of zonotopes from their generators
+
+A colour solid is the Minkowski sum of the line segments [0, g] for each row g of the
+fractional yield curves, which makes it a zonotope. Rather than growing the solid one
+segment at a time, we can enumerate its vertices and facets directly.
+
+Algorithm
+=========
+
+Every facet of an n dimensional zonotope is parallel to the span of n-1 of its generators.
+For a set of n-1 generators, S, with normal u, the facet on the +u side consists of the points
+
+    sum_{i not in S, g_i.u > 0} g_i  +  sum_{i in S} t_i g_i,      0 <= t_i <= 1
+
+so its vertices are obtained by choosing each t_i to be zero or one. The same holds on the -u side.
+Each vertex is therefore a sum over a subset of the generators, which we record as a boolean
+mask. Working with masks means that duplicate vertices (a vertex is shared by many facets)
+can be removed exactly, and the coordinates only need to be calculated once per vertex.
+
+If no other generator is parallel to the facet, it is a parallelotope, and we triangulate it
+by splitting the unit (n-1)-cube into (n-1)! simplices, one for each ordering of its axes.
+
+Generators that are exact multiples of each other are combined before we start, which does not
+change the zonotope. Some facets can still have more than n-1 generators parallel to them, for example,
+when the yield curves are exactly zero for one receptor over part of the spectrum. Such a facet is the
+(n-1) dimensional zonotope of all the generators parallel to it, which is found in the same way, and
+triangulated by joining one of its vertices to the simplices of its boundary.
+
+Fractional yield curves often have long tails in which the generators are almost parallel.
+The combinatorial structure of the solid depends only on the signs of g_i.u, so where a normal
+is poorly conditioned, or a sign is too close to call in floating point, it is recalculated
+exactly using integer arithmetic.
+
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, combinations, islice, permutations, product
+
+from numpy import array, zeros, concatenate, dot, sqrt, sum, abs, packbits, unpackbits, unique, \
+    void, ascontiguousarray, arange, repeat, tile, prod, nonzero, maximum, empty, argsort, arctan2, cumsum, add, \
+    argmax, delete
+from numpy.linalg import det
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from .hull import HullData
+
+
+class DegenerateGenerators(ValueError):
+    """ Raised when the generators of a zonotope do not span the space, or are not in general position where
+    a method needs them to be """
+    pass
+
+
+def generalised_cross(vectors: array):
+    """ Vectors perpendicular to sets of n-1 vectors in n dimensions
+
+    Args:
+        vectors: k-by-(n-1)-by-n array containing k sets of n-1 vectors
+
+    Returns:
+        k-by-n array of normals (of zero length where the n-1 vectors are linearly dependent)
+    """
+
+    n_sets, n_vectors, n_dims = vectors.shape
+
+    normals = zeros((n_sets, n_dims), dtype=float)
+    for j in range(n_dims):
+        minor = concatenate((vectors[:, :, :j], vectors[:, :, j+1:]), axis=2)
+        normals[:, j] = (-1)**j * det(minor)
+
+    return normals
+
+
+def _exact_integers(generators: array):
+    """ Scale floating point generators by a power of two so that every entry is an integer
+
+    Returns:
+        list of lists of python integers, the scaled generators
+    """
+
+    ratios = [[float(x).as_integer_ratio() for x in row] for row in generators]
+    scale = max([denominator for row in ratios for _, denominator in row])
+
+    return [[numerator * (scale // denominator) for numerator, denominator in row] for row in ratios]
+
+
+def _exact_det(matrix: list):
+    """ Determinant of a square matrix of integers, using Bareiss' fraction free elimination """
+
+    matrix = [list(row) for row in matrix]
+    n = len(matrix)
+
+    sign = 1
+    previous = 1
+    for i in range(n-1):
+        pivot = next((k for k in range(i, n) if matrix[k][i] != 0), None)
+        if pivot is None:
+            return 0
+
+        if pivot != i:
+            matrix[i], matrix[pivot] = matrix[pivot], matrix[i]
+            sign = -sign
+
+        for k in range(i+1, n):
+            for j in range(i+1, n):
+                matrix[k][j] = (matrix[k][j] * matrix[i][i] - matrix[k][i] * matrix[i][j]) // previous
+
+        previous = matrix[i][i]
+
+    return sign * matrix[n-1][n-1]
+
+
+def _exact_normal(vectors: list):
+    """ Exact version of `generalised_cross` for a single set of n-1 integer vectors """
+
+    n_dims = len(vectors[0])
+
+    return [(-1)**j * _exact_det([row[:j] + row[j+1:] for row in vectors]) for j in range(n_dims)]
+
+
+def _exact_sign(normal: list, vector: list):
+    """ Exact sign of the dot product of two integer vectors """
+
+    total = 0
+    for n, x in zip(normal, vector):
+        total += n * x
+
+    return (total > 0) - (total < 0)
+
+
+def _approximate(vector: list):
+    """ Floating point vector parallel to a vector of (possibly very large) integers """
+
+    shift = max([x.bit_length() for x in vector]) - 60
+    if shift > 0:
+        vector = [x >> shift for x in vector]
+
+    return array(vector, dtype=float)
+
+
+def _exactly_parallel(a: list, b: list):
+    """ Check whether two integer vectors are positive multiples of each other """
+
+    if any(x*y < 0 for x, y in zip(a, b)):
+        return False
+
+    return all(a[i]*b[j] == a[j]*b[i] for i in range(len(a)) for j in range(i+1, len(a)))
+
+
+def _combine_parallel(generators: array, chunk_size: int = 256):
+    """ Remove zero length generators and combine parallel ones, neither of which changes the zonotope
+
+    Args:
+        generators: m-by-n array, the rows of which are the generators
+        chunk_size: number of rows to compare with the others at a time
+
+    Returns:
+        tuple of (combined, labels), the combined generators, in the same order as the input, and for each input
+        generator, the index of the combined generator it is part of (-1 for zero length generators)
+    """
+
+    n_entries, n_dims = generators.shape
+
+    lengths = sqrt(sum(generators**2, axis=1))
+    kept = arange(n_entries)[lengths > 0]
+    generators = generators[kept, :]
+    lengths = lengths[kept]
+    n_gens = generators.shape[0]
+
+    labels = zeros(n_entries, dtype=int) - 1
+
+    # Look for pairs of (nearly) parallel vectors, then check them exactly
+    directions = generators / lengths.reshape(-1, 1)
+    integers = _exact_integers(generators)
+    pairs = []
+    for start in range(0, n_gens, chunk_size):
+        cosines = dot(directions[start:start+chunk_size, :], directions.T)
+        for i, j in zip(*nonzero(cosines > 1 - 1e-12)):
+            i += start
+            if i < j and _exactly_parallel(integers[i], integers[j]):
+                pairs.append((i, j))
+
+    if len(pairs) == 0:
+        labels[kept] = arange(n_gens)
+        return generators, labels
+
+    pairs = array(pairs, dtype=int)
+    connections = coo_matrix((zeros(len(pairs)) + 1, (pairs[:, 0], pairs[:, 1])), shape=(n_gens, n_gens))
+    n_groups, groups = connected_components(connections, directed=False)
+
+    # Number the groups in order of first appearance, and sum within each one
+    _, first = unique(groups, return_index=True)
+    order = zeros(n_groups, dtype=int)
+    order[groups[sorted(first)]] = arange(n_groups)
+    groups = order[groups]
+
+    combined = zeros((n_groups, n_dims), dtype=float)
+    for i in range(n_gens):
+        combined[groups[i], :] += generators[i, :]
+
+    labels[kept] = groups
+
+    return combined, labels
+
+
+def _prepare_generators(generators: array, chunk_size: int = 256):
+    """ Remove zero length generators, combine parallel ones (neither changes the zonotope) and check there are enough
+
+    Args:
+        generators: m-by-n array, the rows of which are the generators
+        chunk_size: number of rows to compare with the others at a time
+
+    Returns:
+        array of generators, in the same order as the input
+    """
+
+    n_dims = generators.shape[1]
+    n_gens = int((generators != 0).any(axis=1).sum())
+
+    if n_gens < n_dims:
+        raise ValueError("Need at least %i non-zero generators for a %i-D zonotope, got %i."
+                         % (n_dims, n_dims, n_gens))
+
+    return _combine_parallel(generators, chunk_size)[0]
+
+
+def _mask_keys(masks: array):
+    """ Pack boolean rows into byte strings so that they can be compared exactly """
+
+    packed = ascontiguousarray(packbits(masks, axis=1))
+    return packed.view(void(packed.shape[1])).ravel()
+
+
+def _mask_points(keys: array, generators: array):
+    """ Turn packed masks back into boolean arrays and sum the corresponding generators """
+
+    packed = keys.view('u1').reshape(len(keys), -1)
+    masks = unpackbits(packed, axis=1, count=generators.shape[0])
+
+    return dot(masks.astype(float), generators)
+
+
+def _cube_simplices(n_free: int):
+    """ Triangulation of the unit cube in n_free dimensions
+
+    Each ordering of the axes gives a path along the edges from the origin to the opposite corner,
+    the corners on each path form a simplex. Corners are given as indices
+    into `product([False, True], repeat=n_free)`.
+    """
+
+    place_values = 2**arange(n_free-1, -1, -1)
+
+    paths = []
+    for order in permutations(range(n_free)):
+        corner = zeros(n_free, dtype=int)
+        path = [0]
+        for axis in order:
+            corner[axis] = 1
+            path.append(dot(corner, place_values))
+        paths.append(path)
+
+    return array(paths, dtype=int)
+
+
+def _subsets(n_gens: int, n_free: int, first_indices):
+    """ All the sets of n_free generator indices (in ascending order) that begin with one of `first_indices` """
+
+    return chain.from_iterable(
+        ((first,) + rest for rest in combinations(range(first+1, n_gens), n_free-1))
+        for first in first_indices)
+
+
+def _facets(generators: array, chunk_size: int, first_indices):
+    """ Enumerate the facets of a zonotope, see `zonotope_vertices` and `zonotope_hull`
+
+    Only the facets spanned by sets of generators whose lowest index is in `first_indices` are found,
+    so that the work can be split up, the results can be recombined with `_merge_facets`.
+
+    Args:
+        generators: output of `_prepare_generators`
+        chunk_size: Number of generator subsets to process at a time
+        first_indices: Iterable of generator indices
+
+    Returns:
+        tuple of unique packed vertex masks, indices of these for the vertices of each parallelotope facet
+        (ordered as in `product([False, True], repeat=n-1)`), unit facet normals and facet offsets, followed by
+        a dictionary describing the facets with more than n-1 generators parallel to them, see `_facet_cells`,
+        its values are tuples of (indices of the parallel generators, mask of the others included, normal, offset)
+    """
+
+    n_gens, n_dims = generators.shape
+    lengths = sqrt(sum(generators**2, axis=1))
+    integers = _exact_integers(generators)
+
+    # All the ways of choosing the end points of the generators within a facet
+    n_free = n_dims - 1
+    choices = array(list(product([False, True], repeat=n_free)), dtype=bool)
+    n_choices = choices.shape[0]
+
+    subsets = _subsets(n_gens, n_free, first_indices)
+
+    keys = [empty(0, dtype=void((n_gens + 7) // 8))]
+    all_normals = [empty((0, n_dims))]
+    all_offsets = [empty(0)]
+    degenerate = {}
+    while True:
+        chunk = array(list(islice(subsets, chunk_size)), dtype=int).reshape(-1, n_free)
+        if len(chunk) == 0:
+            break
+
+        normals = generalised_cross(generators[chunk, :])
+        norms = sqrt(sum(normals**2, axis=1))
+
+        # Where the normal is small compared to the generators it is calculated from it is inaccurate,
+        # so we calculate it exactly, this also tells us which subsets do not span a hyperplane
+        condition = prod(lengths[chunk], axis=1) / maximum(norms, 1e-300)
+        exact_normals = {}
+        for i in nonzero(condition >= 1e6)[0]:
+            exact_normals[i] = _exact_normal([integers[k] for k in chunk[i]])
+            normals[i, :] = _approximate(exact_normals[i])
+            norms[i] = sqrt(sum(normals[i, :]**2))
+            condition[i] = 1.0
+
+        keep = nonzero(norms > 0)[0]
+        exact_normals = {new: exact_normals[old] for new, old in enumerate(keep) if old in exact_normals}
+        chunk = chunk[keep, :]
+        condition = condition[keep]
+        normals = normals[keep, :] / norms[keep].reshape(-1, 1)
+        n_facets = chunk.shape[0]
+
+        if n_facets == 0:
+            continue
+
+        # Which generators are included at the base of the facets on either side
+        dots = dot(normals, generators.T)
+        rows = arange(n_facets).reshape(-1, 1)
+        dots[rows, chunk] = 0.0
+
+        # Resolve signs that are too close to call
+        uncertain = abs(dots) <= 1e-13 * condition.reshape(-1, 1) * lengths
+        uncertain[rows, chunk] = False
+        parallel = set()
+        for i, j in zip(*nonzero(uncertain)):
+            if i not in exact_normals:
+                exact_normals[i] = _exact_normal([integers[k] for k in chunk[i]])
+
+            dots[i, j] = _exact_sign(exact_normals[i], integers[j])
+
+            # Any other generators parallel to the facet mean it is not a parallelotope
+            if dots[i, j] == 0:
+                parallel.add(i)
+
+        # Each of these facets is found once for every spanning subset of its parallel generators,
+        # it is only kept the first time
+        for i in sorted(parallel):
+            indices = nonzero(dots[i, :] == 0)[0]
+            for side in (1, -1):
+                included = side * dots[i, :] > 0
+                key = (tuple(indices), included.tobytes())
+                if key not in degenerate:
+                    offset = -side * dot(dot(included.astype(float), generators), normals[i, :])
+                    degenerate[key] = (indices, included, side * normals[i, :], offset)
+
+        regular = array([i not in parallel for i in range(n_facets)], dtype=bool)
+        chunk = chunk[regular, :]
+        normals = normals[regular, :]
+        dots = dots[regular, :]
+        n_facets = chunk.shape[0]
+
+        if n_facets == 0:
+            continue
+
+        base = concatenate((dots > 0, dots < 0), axis=0)
+        spans = concatenate((chunk, chunk), axis=0)
+
+        normals = concatenate((normals, -normals), axis=0)
+        all_normals.append(normals)
+        all_offsets.append(-sum(dot(base.astype(float), generators) * normals, axis=1))
+
+        # Add every combination of the generators spanning the facet
+        masks = repeat(base, n_choices, axis=0)
+        rows = arange(masks.shape[0]).reshape(-1, 1)
+        masks[rows, repeat(spans, n_choices, axis=0)] = tile(choices, (2*n_facets, 1))
+
+        keys.append(_mask_keys(masks))
+
+    unique_keys, facet_vertices = unique(concatenate(keys), return_inverse=True)
+
+    return (unique_keys,
+            facet_vertices.reshape(-1, n_choices),
+            concatenate(all_normals).reshape(-1, n_dims),
+            concatenate(all_offsets),
+            degenerate)
+
+
+def _merge_facets(parts: list):
+    """ Combine sets of facets calculated by `_facets`, removing duplicate vertices
+
+    All the vertex keys are deduplicated with a single call to unique
+    """
+
+    keys, inverse = unique(concatenate([part[0] for part in parts]), return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    facet_vertices = []
+    degenerate = {}
+    start = 0
+    for part_keys, part_vertices, _, _, part_degenerate in parts:
+        facet_vertices.append(inverse[start:start + len(part_keys)][part_vertices])
+        degenerate.update(part_degenerate)
+        start += len(part_keys)
+
+    return (keys,
+            concatenate(facet_vertices, axis=0),
+            concatenate([part[2] for part in parts], axis=0),
+            concatenate([part[3] for part in parts]),
+            degenerate)
+
+
+def _all_facets(generators: array, chunk_size: int, workers: int):
+    """ Enumerate all the facets of a zonotope, splitting the work between several processes if requested
+
+    The generator subsets are dealt out to the workers according to their lowest index, and
+    the facets found by each are merged in this process. No more workers are used than there are CPUs.
+
+    Args:
+        generators: output of `_prepare_generators`
+        chunk_size: Number of generator subsets to process at a time
+        workers: Number of processes to use
+
+    Returns:
+        the output of `_facets`, for all facets
+    """
+
+    n_gens = generators.shape[0]
+
+    workers = min(workers, os.cpu_count() or 1)
+
+    if workers <= 1:
+        return _facets(generators, chunk_size, range(n_gens))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        # Interleave the starting indices, as there are fewer subsets starting with later ones
+        futures = [executor.submit(_facets, generators, chunk_size, range(i, n_gens, workers))
+                   for i in range(workers)]
+        parts = [future.result() for future in futures]
+
+    return _merge_facets(parts)
+
+
+def zonotope_vertices(generators: array, chunk_size: int = 2048, workers: int = 1):
+    """ Calculate the vertices of the zonotope generated by the rows of `generators`
+
+    The zonotope is the set of all sums of the form sum_i t_i g_i, with 0 <= t_i <= 1
+
+    Args:
+        generators: m-by-n array, the rows of which are the generators
+        chunk_size: Number of generator subsets to process at a time, limits memory use
+        workers: Number of processes to use
+
+    Returns:
+        array of the vertices of the zonotope
+
+    Raises:
+        DegenerateGenerators: if the generators do not span n dimensions
+
+    """
+
+    return zonotope_hull(generators, chunk_size, workers).points
+
+
+def zonotope_hull(generators: array, chunk_size: int = 2048, workers: int = 1):
+    """ Calculate the boundary of the zonotope generated by the rows of `generators`
+
+    Args:
+        generators: m-by-n array, the rows of which are the generators
+        chunk_size: Number of generator subsets to process at a time, limits memory use (per process)
+        workers: Number of processes to use
+
+    Returns:
+        a HullData object, describing the triangulated boundary of the zonotope
+
+    Raises:
+        DegenerateGenerators: if the generators do not span n dimensions
+
+    """
+
+    generators = _prepare_generators(generators)
+
+    keys, simplices, equations, _ = _triangulated_boundary(generators, chunk_size, workers)
+
+    return HullData(_mask_points(keys, generators), simplices, equations)
+
+
+def _triangulated_boundary(generators: array, chunk_size: int, workers: int):
+    """ Triangulate the boundary of a zonotope
+
+    Args:
+        generators: output of `_prepare_generators`
+        chunk_size: Number of generator subsets to process at a time
+        workers: Number of processes to use
+
+    Returns:
+        tuple of (keys, simplices, equations, labels), the packed masks of the vertices, the indices of these for
+        the vertices of each (n-1)-simplex, [normal, offset] for each simplex, and the facet each simplex is part of
+    """
+
+    n_gens, n_dims = generators.shape
+
+    keys, facet_vertices, normals, offsets, degenerate = _all_facets(generators, chunk_size, workers)
+
+    # If all the generators are parallel to one hyperplane, both sides of the "facet" are the same
+    if (len(normals) == 0 and len(degenerate) == 0) or any(len(value[0]) == n_gens for value in degenerate.values()):
+        raise DegenerateGenerators("Generators do not span a %i-D space." % n_dims)
+
+    # Triangulate each parallelotope
+    paths = _cube_simplices(n_dims - 1)
+
+    all_keys = [keys]
+    simplices = [facet_vertices[:, paths].reshape(-1, n_dims)]
+    equations = [repeat(concatenate((normals, offsets.reshape(-1, 1)), axis=1), paths.shape[0], axis=0)]
+    labels = [repeat(arange(len(normals)), paths.shape[0])]
+
+    # Then the facets with more generators parallel to them
+    n_keys = len(keys)
+    for label, key in enumerate(sorted(degenerate), len(normals)):
+        indices, included, normal, offset = degenerate[key]
+        cell_keys, cells = _facet_cells(generators, indices, included, normal, chunk_size)
+
+        all_keys.append(cell_keys)
+        simplices.append(cells + n_keys)
+        equations.append(repeat(concatenate((normal, [offset])).reshape(1, -1), len(cells), axis=0))
+        labels.append(repeat(label, len(cells)))
+
+        n_keys += len(cell_keys)
+
+    simplices = concatenate(simplices, axis=0)
+
+    # The vertices of these facets are shared with others
+    if len(degenerate) > 0:
+        keys, inverse = unique(concatenate(all_keys), return_inverse=True)
+        simplices = inverse.reshape(-1)[simplices]
+
+    return keys, simplices, concatenate(equations, axis=0), concatenate(labels)
+
+
+def _facet_cells(generators: array, indices: array, included: array, normal: array, chunk_size: int):
+    """ Triangulate a facet of a zonotope that more than n-1 generators are parallel to
+
+    The facet is a translated copy of the (n-1) dimensional zonotope of the parallel generators, this is
+    found in the coordinates that are left after dropping the one with the biggest normal component (which
+    is exact), and split into simplices by joining one of its vertices to the simplices of the facets of its
+    boundary that do not contain it.
+
+    Args:
+        generators: output of `_prepare_generators`
+        indices: indices of the generators parallel to the facet
+        included: mask of the generators whose full length is included in all points of the facet
+        normal: normal to the facet
+        chunk_size: Number of generator subsets to process at a time
+
+    Returns:
+        tuple of (keys, cells), the packed masks of the vertices of the facet, and the indices of these
+        for the vertices of each (n-1)-simplex
+    """
+
+    dropped = argmax(abs(normal))
+    projected = delete(generators[indices, :], dropped, axis=1)
+
+    keys, simplices, _, labels = _triangulated_boundary(projected, chunk_size, 1)
+
+    # Join the first vertex to the parts of the boundary away from it
+    touching = zeros(labels.max() + 1, dtype=bool)
+    touching[labels[(simplices == 0).any(axis=1)]] = True
+
+    far = simplices[~touching[labels], :]
+    cells = concatenate((zeros((len(far), 1), dtype=int), far), axis=1)
+
+    # Masks for all the generators
+    packed = keys.view('u1').reshape(len(keys), -1)
+    masks = zeros((len(keys), generators.shape[0]), dtype=bool)
+    masks[:, :] = included
+    masks[:, indices] = unpackbits(packed, axis=1, count=len(indices))
+
+    return _mask_keys(masks), cells
+
+
+def zonogon_vertices(generators: array, tolerance: float = 1e-12):
+    """ Calculate the vertices of the two dimensional zonotope (zonogon) generated by the rows of `generators`
+
+    Projections of zonotopes are zonotopes of the projected generators, so this gives the outline of any
+    projection of a colour solid without calculating the solid itself.
+
+    The generators are turned to point into the upper half plane, the vertex with the lowest y (then x)
+    being the sum of those that were turned. Going round the zonogon anticlockwise, each edge
+    is one of the generators, first in order of angle, then again, reversed.
+
+    Args:
+        generators: m-by-2 array, the rows of which are the generators
+        tolerance: generators where the sine of the angle between them is smaller than this are treated as parallel
+
+    Returns:
+        array of the vertices of the zonogon, in anticlockwise order, starting with the lowest
+    """
+
+    generators = array(generators, dtype=float)
+
+    if len(generators.shape) != 2 or generators.shape[1] != 2:
+        raise ValueError("Expected an m-by-2 array of generators")
+
+    generators = generators[(generators != 0).any(axis=1), :]
+
+    if len(generators) == 0:
+        return zeros((1, 2))
+
+    downward = (generators[:, 1] < 0) | ((generators[:, 1] == 0) & (generators[:, 0] < 0))
+    start = sum(generators[downward, :], axis=0)
+    generators[downward, :] *= -1
+
+    generators = generators[argsort(arctan2(generators[:, 1], generators[:, 0]), kind="stable"), :]
+
+    # Combine consecutive parallel generators, which would otherwise give vertices in the middle of edges
+    lengths = sqrt(sum(generators**2, axis=1))
+    sines = (generators[:-1, 0] * generators[1:, 1] - generators[:-1, 1] * generators[1:, 0]) \
+        / (lengths[:-1] * lengths[1:])
+
+    groups = concatenate(([0], cumsum(sines > tolerance)))
+    combined = zeros((groups[-1] + 1, 2))
+    add.at(combined, groups, generators)
+
+    steps = concatenate((combined, -combined), axis=0)
+
+    return start + concatenate((zeros((1, 2)), cumsum(steps[:-1, :], axis=0)), axis=0)
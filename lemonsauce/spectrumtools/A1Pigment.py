@@ -1,28 +1,19 @@
-from numpy import exp, array
+from collections import OrderedDict
 
+from numpy import exp, array, asarray, unique, stack
 
-def visual_pigment(wls: array, lambdamax: float):
-    """
 
-    A1 Pigment Spectrum
-    ===================
+# Maximum number of templates (one wavelength grid and peak each) to remember
+TEMPLATE_CACHE_SIZE = 1024
 
+_templates = OrderedDict()
 
-    An implementation of
-    Govardovskii, V. I., N. Fyhrquist, T. Reuter, D. G. Kuzmin, and
-    K. Donner. 2000. In search of the visual pigment template. Visual
-    neuroscience 17:509–528.
 
-    Args:
-              wls: List of _wavelengths to evaluate at
-        lambdamax: peak value
-
-    """
+def _template(wls: array, lambdamax: array):
+    """ The template for an array of peak wavelengths, evaluated at wavelengths broadcast against them """
 
     # Ingore PIP so that the notion here matches the paper
 
-    lambdamax = float(lambdamax)
-    
     A = 69.7
     B = 28
     b = 0.922
@@ -44,6 +35,60 @@ def visual_pigment(wls: array, lambdamax: float):
     
     return output + Abeta*exp(-((wls - lambdabeta)/bbeta)**2)
 
+
+def visual_pigment(wls: array, lambdamax):
+    """
+
+    A1 Pigment Spectrum
+    ===================
+
+
+    An implementation of
+    Govardovskii, V. I., N. Fyhrquist, T. Reuter, D. G. Kuzmin, and
+    K. Donner. 2000. In search of the visual pigment template. Visual
+    neuroscience 17:509–528.
+
+    Templates are remembered for each wavelength grid and peak value, up to TEMPLATE_CACHE_SIZE of them,
+    the least recently used being forgotten first.
+
+    Args:
+              wls: List of _wavelengths to evaluate at
+        lambdamax: peak value, or a list of K of them
+
+    Returns:
+        array of the template at each wavelength, or, for a list of peaks, an N-by-K array with a
+        column for each one
+
+    """
+
+    wls = asarray(wls, dtype=float)
+    peaks = asarray(lambdamax, dtype=float)
+
+    grid = (wls.shape, wls.tobytes())
+
+    # Work out the ones we haven't seen before in one go
+    missing = [peak for peak in unique(peaks) if (grid, float(peak)) not in _templates]
+    if len(missing) > 0:
+        templates = _template(wls.reshape(-1, 1), array(missing).reshape(1, -1))
+        for i, peak in enumerate(missing):
+            column = templates[:, i].reshape(wls.shape)
+            column.flags.writeable = False
+            _templates[(grid, float(peak))] = column
+
+    columns = []
+    for peak in peaks.reshape(-1):
+        key = (grid, float(peak))
+        _templates.move_to_end(key)
+        columns.append(_templates[key])
+
+    while len(_templates) > TEMPLATE_CACHE_SIZE:
+        _templates.popitem(last=False)
+
+    if peaks.shape == ():
+        return columns[0].copy()
+
+    return stack(columns, axis=-1)
+
 # A quick test
 if __name__ == "__main__":
     import matplotlib.pyplot as plt
@@ -1,11 +1,11 @@
 from .A1Pigment import visual_pigment as template_pigment
 from .cie_d65 import d65
-from .extreme import extreme_spectrum
+from .extreme import extreme_spectrum, extreme_spectra
 from .util import total_absorption, total_transmission, normalise_spectral_density
 from .human import reflectance_to_rgb, spectrum_to_rgb
 
 __all__ = [
-    "template_pigment", "d65", "extreme_spectrum",
+    "template_pigment", "d65", "extreme_spectrum", "extreme_spectra",
     "total_absorption", "total_transmission", "normalise_spectral_density",
     "reflectance_to_rgb", "spectrum_to_rgb"]
 
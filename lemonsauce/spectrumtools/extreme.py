@@ -1,29 +1,81 @@
 from numpy import *
 
 
-def extreme_spectrum(wavelengths: array, one_first: bool, *transitions):
+def extreme_spectrum(wavelengths: array, one_first: bool, *transitions, compact: bool = False):
     """ Create an "extreme spectrum"
 
     Args:
         wavelengths (array): wavelengths at which to calculate the spectrum
         one_first (bool): Should the reflectance start with one (true) or zero (false)
         transitions (float*): Points at which the spectrum should change between zero and one, or vice-versa
+        compact (bool): Return the spectrum in terms of where it changes, see `extreme_spectra`
 
     Returns:
-        an extreme spectrum
+        an extreme spectrum, or, if compact, the tuple (value at the first wavelength, transition indices)
     """
 
-    transitions = list(transitions)
-    transitions.sort()
+    spectra = extreme_spectra(wavelengths, one_first, array([transitions], dtype=float).reshape(1, -1),
+                              compact=compact)
 
-    def value(wavelength: float):
-        is_one = one_first
-        for transition in transitions:
-            is_one ^= (transition > wavelength)
+    if compact:
+        start, indices = spectra
+        return start[0], indices[0, :]
 
-        return 1.0 if is_one else 0.0
+    return spectra[0, :]
 
-    return array([value(wavelength) for wavelength in wavelengths])
+
+def extreme_spectra(wavelengths: array, one_first, transitions: array, compact: bool = False):
+    """ Create many "extreme spectra" at once
+
+    The value at a wavelength, w, is one_first, flipped once for every transition greater than w.
+
+    In compact form, each spectrum is given by its value at the first wavelength and, for each transition,
+    the index of the first wavelength after it (i.e. the index at which the value changes), so
+    the value at index i is the starting value flipped once for every index <= i. This needs much
+    less memory than the spectra themselves, wavelengths must be in ascending order to use it.
+
+    Args:
+        wavelengths (array): wavelengths at which to calculate the spectra
+        one_first (bool or array): Should the reflectance start with one (true) or zero (false), for
+            all spectra, or one value for each
+        transitions (array): M-by-k array, each row being the points at which a spectrum changes
+        compact (bool): Return the compact form, rather than the spectra
+
+    Returns:
+        M-by-N array of spectra, or, if compact, the tuple (M values at the first wavelength,
+        M-by-k array of transition indices, sorted along each row)
+    """
+
+    wavelengths = asarray(wavelengths, dtype=float)
+    transitions = sort(atleast_2d(asarray(transitions, dtype=float)), axis=1)
+
+    n_spectra, n_transitions = transitions.shape
+    n_wavelengths = len(wavelengths)
+
+    one_first = broadcast_to(asarray(one_first, dtype=bool), (n_spectra,))
+
+    order = argsort(wavelengths, kind="stable")
+    indices = searchsorted(wavelengths[order], transitions, side="left")
+
+    # Below all the transitions, every one of them has flipped the value
+    start = one_first ^ (n_transitions % 2 == 1)
+
+    if compact:
+        if any(order != arange(n_wavelengths)):
+            raise ValueError("Wavelengths must be in ascending order for the compact form")
+
+        return start, indices
+
+    # Count the flips up to each wavelength
+    flat_indices = (arange(n_spectra).reshape(-1, 1) * (n_wavelengths + 1) + indices).ravel()
+    flips = bincount(flat_indices, minlength=n_spectra * (n_wavelengths + 1)).reshape(n_spectra, -1)
+
+    is_one = start.reshape(-1, 1) ^ (cumsum(flips[:, :n_wavelengths], axis=1) % 2 == 1)
+
+    spectra = empty((n_spectra, n_wavelengths))
+    spectra[:, order] = is_one
+
+    return spectra
 
 
 if __name__ == "__main__":
@@ -11,7 +11,7 @@ The data loaded here is used in the other examples.
 """
 
 # Numpy imports
-from numpy import arange, transpose, array
+from numpy import arange
 
 
 # Imports from the colour and spectrum packages
@@ -21,23 +21,16 @@ lambda_min = 300
 lambda_max = 750
 wavelengths = arange(lambda_min, lambda_max)
 
-spectral_sensitivities = []
-for lmax in [420, 500, 620, 580]:
-
-    # Use A1 Pigment template
-    # Assume an optical density of 1
-    ss = total_absorption(template_pigment(wavelengths, lmax), 1)
-    spectral_sensitivities.append(ss)
+# Use A1 Pigment template, one column for each peak wavelength
+# Assume an optical density of 1
+spectral_sensitivities = total_absorption(template_pigment(wavelengths, [420, 500, 620, 580]), 1)
 
 # factor in the illuminant
 illumination = d65(wavelengths)
-example_fraction_yields = [ss * illumination for ss in spectral_sensitivities]
-
-# normalise
-example_fraction_yields = [cf / sum(cf) for cf in example_fraction_yields]
+example_fraction_yields = spectral_sensitivities * illumination.reshape(-1, 1)
 
-# make into an array with the correct orientation
-example_fraction_yields = transpose(array(example_fraction_yields))
+# normalise each column
+example_fraction_yields = example_fraction_yields / example_fraction_yields.sum(axis=0)
 
 # If we're running this file as a script, plot the data we have calculated
 if __name__ == "__main__":
@@ -48,7 +41,7 @@ if __name__ == "__main__":
 
         plt.subplot(2, 1, 1)
         plt.title("Spectral Sensitivities")
-        plt.plot(wavelengths, spectral_sensitivities[i])
+        plt.plot(wavelengths, spectral_sensitivities[:, i])
 
         plt.subplot(2, 1, 2)
         plt.title("Fractional Yield under D65 Illumination")
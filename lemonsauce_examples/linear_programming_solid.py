@@ -36,22 +36,20 @@ solid = ColourSolid(example_fraction_yields[:, (0, 2)], wavelengths=wavelengths)
 # Sample the angles around a point
 angles = arange(0, 1, 0.05)
 
-for a in angles:
+# Convert angles to directions from the centre of the solid
+directions = 0.5 * array([sin(2*pi*angles), cos(2*pi*angles)]).T
 
-    # Convert angles to points around the centre of the solid
-    x = 0.5 * (1 + sin(2*pi*a))
-    y = 0.5 * (1 + cos(2*pi*a))
+# solid.boundary_sweep finds the boundary in each direction, falling back to linear programming
+# for any direction where the default solver cannot verify its result
+colours, spectra = solid.boundary_sweep(directions)
 
-    # solid.boundary_spectrum uses a linear programming method
-    spec = solid.boundary_spectrum(array([x, y]))
-    colour = solid.colour(spec)
+for a, colour, spec in zip(angles, colours, spectra):
 
     plot_colour = reflectance_to_rgb(wavelengths, spec)
 
     plt.scatter([colour[0]], [colour[1]], color=plot_colour)
 
-    # It's a bit slow, so a printout let's us know that something is going on!
-    print("%d deg. : %.4g, %.4g" % (a*360, x, y))
+    print("%d deg. : %.4g, %.4g" % (a*360, colour[0], colour[1]))
 
     plt.plot([0.5, colour[0]], [0.5, colour[1]], 'k:')
 
@@ -18,7 +18,7 @@ the second plot.
 
 """
 
-from numpy import zeros, array, transpose
+from numpy import zeros, array, transpose, concatenate, roll, sort, unique
 
 # For plotting we need matplotlib
 import matplotlib.pyplot as plt
@@ -150,3 +150,26 @@ plt.show()
 
 s2.write_obj("test_solid_2d.obj")
 s3.write_obj("test_solid_3d.obj")
+
+#
+# They can also be written to binary PLY, STL and glTF (GLB) files, which are smaller and quicker to write
+#
+
+s3.write_ply("test_solid_3d.ply")
+s3.write_stl("test_solid_3d.stl")
+s3.write_glb("test_solid_3d.glb")
+
+#
+# Triangles lying in the same plane can be merged into the true (polygonal) faces of the solid
+#
+
+s3.write_obj("test_solid_3d_merged.obj", merge=True)
+
+# The merged faces still make a closed surface, so the numbers of vertices (V), edges (E) and faces (F)
+# satisfy Euler's formula, V - E + F = 2
+polygons = s3.polytope_faces.polygons()
+
+n_vertices = len(unique(concatenate(polygons)))
+n_edges = len(unique(sort(concatenate([array([p, roll(p, -1)]).T for p in polygons]), axis=1), axis=0))
+
+print("Merged faces: V - E + F = %i" % (n_vertices - n_edges + len(polygons)))
@@ -1,7 +1,7 @@
 """ Example calculations of vividness """
 
 # Python packages
-from numpy import random
+from numpy import random, sqrt
 
 # Local packages, ColourSolid does all the work
 from lemonsauce import ColourSolid
@@ -18,7 +18,7 @@ from lemonsauce_examples.fractional_yields import example_fraction_yields, wavel
 #
 # Create a trichromat colour solid
 #
-solid = ColourSolid(example_fraction_yields[:, :3])
+solid = ColourSolid(example_fraction_yields[:, :3], wavelengths)
 
 
 #
@@ -106,3 +106,21 @@ print("             variance: %g" % v2)
 
 print("Three transition mean: %g" % m3)
 print("             variance: %g" % v3)
+
+#
+#
+#   For many spectra, it is much quicker to work with the transitions directly,
+#   the catches of extreme spectra can be found without making the spectra themselves
+#
+#
+
+n_many = 1000
+
+transitions = lambda_min + (lambda_max - lambda_min)*random.rand(n_many, 3)
+one_first = random.rand(n_many) > 0.5
+
+colours = solid.colours_from_transitions(one_first, transitions)
+vividness = sqrt(((colours - 0.5)**2).sum(axis=1)) / solid.boundary_distance_many(colours)
+
+print()
+print("Three transition mean (%i spectra): %g" % (n_many, vividness.mean()))
@@ -0,0 +1,22 @@
+from numpy import arange
+from scipy.spatial import ConvexHull
+
+from lemonsauce.spectrumtools.human import cie_xyz_10deg
+from lemonsauce.solidtools.solid import ColourSolid
+from lemonsauce.solidtools.hull import HullData
+
+
+def test_cache_per_method(tmp_path):
+    wavelengths = arange(400, 701, 10.0)
+    xyz = cie_xyz_10deg(wavelengths).T
+
+    zonotope = ColourSolid(xyz, wavelengths=wavelengths, method="zonotope", cache_dir=str(tmp_path))
+    assert isinstance(zonotope.hull_data, HullData)
+
+    # The cache is warm, but only for the zonotope method
+    iterative = ColourSolid(xyz, wavelengths=wavelengths, method="iterative", cache_dir=str(tmp_path))
+    assert isinstance(iterative.hull_data, ConvexHull)
+
+    cached = ColourSolid(xyz, wavelengths=wavelengths, method="zonotope", cache_dir=str(tmp_path))
+    assert cached.hull_data.simplices.shape == zonotope.hull_data.simplices.shape
+    assert (cached.hull_data.simplices == zonotope.hull_data.simplices).all()
@@ -0,0 +1,61 @@
+import pytest
+
+from numpy import arange, array, max, abs
+from numpy.random import default_rng
+
+from lemonsauce.spectrumtools.human import cie_xyz_10deg
+from lemonsauce.solidtools.solid import ColourSolid
+from lemonsauce.solidtools.zonotope import zonotope_hull, DegenerateGenerators
+from lemonsauce.solidtools.incremental import extend_hull
+
+
+def cie_curves():
+    wavelengths = arange(380, 781, 5.0)
+    return wavelengths, cie_xyz_10deg(wavelengths).T
+
+
+def check_hull(hull, tolerance=1e-12):
+    """ Every point is on the inner side of every facet, and every facet is on its own plane """
+    heights = hull.points @ hull.equations[:, :-1].T + hull.equations[:, -1]
+    assert max(heights) < tolerance
+
+    for i in range(hull.points.shape[1]):
+        on_plane = (hull.points[hull.simplices[:, i], :] * hull.equations[:, :-1]).sum(axis=1) + hull.equations[:, -1]
+        assert max(abs(on_plane)) < tolerance
+
+
+@pytest.mark.parametrize("simplify_tolerance", [0.05, 0])
+def test_cie_incremental_hull(simplify_tolerance):
+    """ z is zero beyond ~650nm, so later generators lie in the plane of earlier facets """
+    wavelengths, xyz = cie_curves()
+
+    solid = ColourSolid(xyz, wavelengths=wavelengths, simplify_tolerance=simplify_tolerance, method="incremental")
+    with pytest.warns(UserWarning, match="incremental"):
+        hull = solid.hull_data
+
+    check_hull(hull)
+
+    colours = 0.5 + 0.1*default_rng(0).normal(size=(500, 3))
+    reference = ColourSolid(xyz, wavelengths=wavelengths, simplify_tolerance=simplify_tolerance, method="zonotope")
+
+    assert max(abs(solid.boundary_distance_many(colours, "hull") -
+                   reference.boundary_distance_many(colours, "hull"))) < 1e-10
+
+
+def test_extend_hull_parallel_generator():
+    generators = array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    hull = zonotope_hull(generators)
+
+    with pytest.raises(DegenerateGenerators):
+        extend_hull(hull, array([1.0, 2.0, 0.0]), generators.sum(axis=0)/2)
+
+
+def test_incremental_too_few_entries():
+    """ Fewer non-zero entries than dimensions, so the initial parallelepiped cannot be made """
+    _, xyz = cie_curves()
+
+    solid = ColourSolid(xyz[20:22, :], simplify_tolerance=0, method="incremental")
+
+    # Must be the error that calculate falls back on, not the plain ValueError from zonotope_hull
+    with pytest.raises(DegenerateGenerators):
+        solid._calculate_incremental()
@@ -0,0 +1,35 @@
+import pytest
+
+from math import comb
+
+from numpy import array
+from numpy.linalg import norm
+
+from lemonsauce.solidtools.solid import ColourSolid
+from lemonsauce_examples.fractional_yields import example_fraction_yields
+
+
+@pytest.mark.filterwarnings("ignore")
+@pytest.mark.parametrize("method", ["zonotope", "iterative", "incremental"])
+def test_polytope_faces_4d(method):
+    """ The faces do not depend on how the hull was triangulated, or on rounding in its equations """
+
+    solid = ColourSolid(example_fraction_yields[:, :4], simplify_tolerance=0.1, method=method)
+    n_generators = solid.n_points
+
+    faces = solid.polytope_faces
+
+    # In general position, each facet is a parallelepiped of three generators and each 2-face a parallelogram
+    assert faces.vertex_incidence(3).shape[0] == 2 * comb(n_generators, 3)
+    assert faces.vertex_incidence(2).shape[0] == 2 * comb(n_generators, 2) * (n_generators - 2)
+
+    counts = [faces.vertex_incidence(dimension).shape[0] for dimension in range(4)]
+    assert counts[0] - counts[1] + counts[2] - counts[3] == 0
+
+    normal = array([1.0, 0.5, -0.3, 0.2])
+    section, = solid.section(normal / norm(normal), [0.9])
+
+    reference = ColourSolid(example_fraction_yields[:, :4], simplify_tolerance=0.1, method="zonotope")
+    reference_section, = reference.section(normal / norm(normal), [0.9])
+
+    assert len(section) == len(reference_section)